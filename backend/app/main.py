@@ -1,7 +1,13 @@
+import os
+import threading
+
 from fastapi import FastAPI
+from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.routers import chat
+from app.routers import admin, chat, eligibility
+from app.services import knowledge_service, llm_service
+from app.utils import metrics
 
 app = FastAPI(
     title="SahajAI API",
@@ -26,6 +32,8 @@ app.add_middleware(
 # -----------------------
 
 app.include_router(chat.router)
+app.include_router(eligibility.router)
+app.include_router(admin.router)
 
 # -----------------------
 # Health & Root
@@ -41,20 +49,48 @@ def root():
 
 @app.get("/health")
 def health():
+    kb = knowledge_service.snapshot()
     return {
         "status": "ok",
         "service": "SahajAI backend",
-        "version": app.version
+        "version": app.version,
+        "kb_version": kb.version,
+        "kb_etag": kb.etag,
     }
 
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    # Prometheus text exposition format; see app.utils.metrics
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
 # -----------------------
 # Startup & Shutdown
 # -----------------------
 
+# Set SAHAJ_KB_WATCH_INTERVAL (seconds) to pick up data file edits without
+# a restart; POST /api/admin/reload does the same on demand.
+KB_WATCH_INTERVAL = float(os.environ.get("SAHAJ_KB_WATCH_INTERVAL", "0"))
+_watch_stop = threading.Event()
+
 @app.on_event("startup")
 def on_startup():
     print("🚀 SahajAI backend starting up...")
+    kb = knowledge_service.snapshot()
+    print(f"📚 Knowledge base v{kb.version} ({kb.etag}) loaded from {kb.source}")
+    if KB_WATCH_INTERVAL > 0:
+        threading.Thread(
+            target=knowledge_service.watch,
+            args=(KB_WATCH_INTERVAL, _watch_stop),
+            name="kb-watch",
+            daemon=True,
+        ).start()
+        print(f"👀 Watching knowledge base every {KB_WATCH_INTERVAL:g}s")
+    if llm_service.enabled():
+        print(f"🤖 LLM {llm_service.LLM_MODEL} at {llm_service.LLM_URL} "
+              f"(budget {llm_service.LLM_BUDGET_MS:g} ms)")
 
 @app.on_event("shutdown")
-def on_shutdown():
+async def on_shutdown():
+    _watch_stop.set()
+    await llm_service.aclose()
     print("🛑 SahajAI backend shutting down...")
@@ -0,0 +1,76 @@
+import asyncio
+import hmac
+import os
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
+
+from app.services import knowledge_service
+from app.utils.sampler import SAMPLER
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+# admin endpoints are disabled unless a token is configured
+ADMIN_TOKEN = os.environ.get("SAHAJ_ADMIN_TOKEN", "")
+
+MAX_PROFILE_SECONDS = 300
+
+
+def require_admin(x_admin_token: str = Header(default="")):
+    if not ADMIN_TOKEN or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+
+@router.get("/kb", dependencies=[Depends(require_admin)])
+def kb_info():
+    return knowledge_service.snapshot().info()
+
+
+@router.post("/reload", dependencies=[Depends(require_admin)])
+async def reload_kb(force: bool = False):
+    # indexes are rebuilt in a worker thread; requests keep using the old
+    # snapshot until the new one is swapped in
+    kb = await run_in_threadpool(knowledge_service.reload, force)
+    return kb.info()
+
+
+# Sampling profiler. Each worker process profiles itself, so with several
+# uvicorn workers the stacks come from whichever one served the request.
+# Output is collapsed stacks: `flamegraph.pl out.txt > out.svg`, or open the
+# file in speedscope.
+
+def _start_sampler(interval_ms, seconds):
+    try:
+        SAMPLER.start(interval_ms / 1000, seconds)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+
+
+@router.get("/profile", response_class=PlainTextResponse, dependencies=[Depends(require_admin)])
+async def profile(
+    seconds: float = Query(10.0, gt=0, le=MAX_PROFILE_SECONDS),
+    interval_ms: float = Query(5.0, ge=1, le=1000),
+):
+    _start_sampler(interval_ms, seconds)
+    await asyncio.sleep(seconds)
+    return SAMPLER.stop()
+
+
+@router.post("/profile/start", dependencies=[Depends(require_admin)])
+def profile_start(
+    seconds: float = Query(60.0, gt=0, le=MAX_PROFILE_SECONDS),
+    interval_ms: float = Query(5.0, ge=1, le=1000),
+):
+    _start_sampler(interval_ms, seconds)
+    return SAMPLER.status()
+
+
+@router.post("/profile/stop", response_class=PlainTextResponse, dependencies=[Depends(require_admin)])
+def profile_stop():
+    return SAMPLER.stop()
+
+
+@router.get("/profile/status", dependencies=[Depends(require_admin)])
+def profile_status():
+    return SAMPLER.status()
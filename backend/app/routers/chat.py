@@ -1,107 +1,525 @@
-from fastapi import APIRouter
+import json
+import os
+import time
+from typing import List
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from app.schemas.chat import ChatRequest, ChatResponse
-from app.services.intent_router import detect_intent, split_questions
-from app.services.knowledge_service import get_document_info, get_scheme_info
+from app.services import llm_service
+from app.services.answer_fragments import LANGUAGES, template
+from app.services.eligibility import profile_from_text
+from app.services.intent_router import detect_intents, rank_intents, split_questions
+from app.services.knowledge_service import KnowledgeBase, on_reload, snapshot
+from app.services.office_service import PINCODE_RE, office_type_for
+from app.services.responses import GREETINGS, constant_body, json_response, render
+from app.services.search_service import MIN_FIELD_SCORE, MIN_SCORE, score_to_confidence
+from app.services.vector_service import embed_hashes
+from app.utils import metrics
+from app.utils.lru_cache import TTLCache
+from app.utils.semantic_cache import SemanticCache
+from app.utils.text import DEVANAGARI_RE, ParsedQuery, normalize
 
 router = APIRouter(prefix="/api/chat", tags=["chat"])
 
+# intent -> knowledge base kind searched for it
+INTENT_KINDS = {
+    "document_help": "document",
+    "scheme_info": "scheme",
+}
+
+# -------------------------
+# RESPONSE CACHE
+# -------------------------
+# Answers are a pure function of (normalised message, language) and the KB,
+# so repeated questions skip splitting, intent detection and lookup. Entries
+# are keyed on the KB etag too, so an answer computed against a snapshot that
+# has since been replaced can never be served.
+RESPONSE_CACHE = TTLCache(
+    maxsize=int(os.environ.get("SAHAJ_CACHE_SIZE", "1024")),
+    ttl=float(os.environ.get("SAHAJ_CACHE_TTL", "300")),
+)
+on_reload(RESPONSE_CACHE.clear)
+
+# -------------------------
+# SEMANTIC CACHE
+# -------------------------
+# Rephrasings of a question ("docs for aadhaar", "aadhaar papers needed")
+# miss the exact cache. On such a miss the message is checked against
+# recent answers by n-gram vector similarity, but only among those whose
+# guard matches: per question, the same intent, KB entries named, office
+# type and numbers (pincodes), so a near-identical question about another
+# document or pincode is never served the wrong answer. One partition per
+# request_language() value, emptied whenever the KB etag changes.
+# Computing the guard costs about as much as a rule-based answer, so by
+# default the cache is only on when answers go through the LLM.
+SEMANTIC_CACHE = SemanticCache(
+    maxsize=int(os.environ.get("SAHAJ_SEMANTIC_CACHE_SIZE", "1024" if llm_service.enabled() else "0")),
+    threshold=float(os.environ.get("SAHAJ_SEMANTIC_CACHE_THRESHOLD", "0.45")),
+    dim=int(os.environ.get("SAHAJ_SEMANTIC_CACHE_DIM", "128")),
+    max_partitions=len(LANGUAGES) + 1,    # + "other"
+)
+on_reload(SEMANTIC_CACHE.clear)
+
+# answers to these depend on nothing the guard does not capture; eligibility
+# answers depend on free-text profile details, so they are never shared
+SEMANTIC_INTENTS = frozenset(["document_help", "scheme_info", "office_locator"])
+
+# -------------------------
+# METRICS
+# -------------------------
+# Stage timings are per answer_many() call: one request on /api/chat/, one
+# batch on /api/chat/batch. Children are bound once here so recording is a
+# bisect and two additions (see app.utils.metrics).
+STAGE_SECONDS = metrics.histogram(
+    "sahaj_chat_stage_seconds", "Time spent in each chat pipeline stage.", ["stage"],
+)
+SPLIT_SECONDS = STAGE_SECONDS.labels("split")          # split_questions + parsing
+INTENT_SECONDS = STAGE_SECONDS.labels("intent")        # detect_intents
+LOOKUP_SECONDS = STAGE_SECONDS.labels("lookup")        # resolve(): search, fragments
+BUILD_SECONDS = STAGE_SECONDS.labels("build")          # ChatResponse construction
+SERIALIZE_SECONDS = STAGE_SECONDS.labels("serialize")  # model_dump_json
+
+REQUEST_SECONDS = metrics.histogram(
+    "sahaj_chat_request_seconds", "Chat endpoint handler time.", ["endpoint"],
+)
+CHAT_SECONDS = REQUEST_SECONDS.labels("chat")
+BATCH_SECONDS = REQUEST_SECONDS.labels("batch")
+
+QUESTIONS = metrics.counter(
+    "sahaj_chat_questions_total", "Question fragments by detected intent and language.", ["intent", "language"],
+)
+ANSWERS = metrics.counter(
+    "sahaj_chat_answers_total", "Responses computed (not served from a cache) by mode and language.",
+    ["mode", "language"],
+)
+
+
+@metrics.collector
+def cache_metrics():
+    caches = [("response", RESPONSE_CACHE), ("semantic", SEMANTIC_CACHE)]
+    yield from metrics.sample_lines(
+        "sahaj_cache_hits_total", "Cache hits.", "counter", [((n,), c.hits) for n, c in caches], ["cache"],
+    )
+    yield from metrics.sample_lines(
+        "sahaj_cache_misses_total", "Cache misses.", "counter", [((n,), c.misses) for n, c in caches], ["cache"],
+    )
+    yield from metrics.sample_lines(
+        "sahaj_cache_hit_ratio", "Cache hits / lookups since start.", "gauge",
+        [((n,), c.stats()["hit_ratio"]) for n, c in caches], ["cache"],
+    )
+    yield from metrics.sample_lines(
+        "sahaj_cache_entries", "Entries currently cached.", "gauge", [((n,), len(c)) for n, c in caches], ["cache"],
+    )
+
+
+MAX_BATCH = int(os.environ.get("SAHAJ_MAX_BATCH", "1000"))
+MAX_ELIGIBLE = 10                # schemes listed in an eligibility answer
+
+
+def request_language(language: str | None) -> str:
+    """
+    The requested language clamped to those answers exist in; anything else
+    is "other". It ends up in metric labels and cache partitions, so a
+    client must not be able to mint new values.
+    """
+    language = language or "en"
+    return language if language in LANGUAGES else "other"
+
+
+def cache_key(message: str, language: str):
+    # trailing punctuation never changes how a message is split or answered
+    return message.rstrip(" ?.!।"), language
+
+
+def reply_language(message: str, language: str) -> str:
+    """
+    The one language a message is answered and labelled in: Hindi if any
+    of it is Devanagari, else the requested one. Every fragment is parsed
+    in it, so a mixed message never gets a reply in two languages.
+    """
+    return "hi" if DEVANAGARI_RE.search(message) else language
+
+
+def parse_questions(message: str, language: str, kb: KnowledgeBase):
+    """ParsedQuery of every question fragment of a normalised message."""
+    language = reply_language(message, language)
+    return [kb.parse(q, language) for q in split_questions(message, language)]
+
+
+def semantic_key(message: str, language: str, kb: KnowledgeBase, questions=None):
+    """(guard, vector) of a message for SEMANTIC_CACHE, or None if it is not shareable."""
+    if SEMANTIC_CACHE.maxsize <= 0:
+        return None
+    if questions is None:
+        questions = parse_questions(message, language, kb)
+    # one guard item per question, holding what resolve() answers it from
+    guard, hashes = [], []
+    for q in questions:
+        ranked = rank_intents(q)
+        intent = ranked[0][0] if ranked else "unknown"
+        if intent == "unknown":
+            continue
+        if intent not in SEMANTIC_INTENTS:
+            return None
+        documents, schemes = kb.find_documents(q), kb.find_schemes(q)
+        if intent in INTENT_KINDS and not (documents or schemes):
+            return None    # answered from whatever BM25 ranks first
+        guard.append((
+            intent, q.language, tuple(documents), tuple(schemes),
+            office_type_for(q.tokens), tuple(w for w in q.words if w.isdigit()),
+        ))
+        hashes += q.ngram_hashes
+    if not guard:
+        return None
+    return tuple(guard), embed_hashes([hashes], SEMANTIC_CACHE.dim)[0]
+
 
 @router.post("/", response_model=ChatResponse)
 async def chat(req: ChatRequest):
-    message = req.message.strip().lower()
-    language = req.language or "en"
+    started = time.perf_counter()
+    try:
+        return json_response(await chat_body(req))
+    finally:
+        CHAT_SECONDS.observe(time.perf_counter() - started)
+
+
+async def chat_body(req: ChatRequest) -> bytes:
+    message = normalize(req.message)
+    language = request_language(req.language)
+
+    # the whole request runs against one KB snapshot, even across a reload
+    kb = snapshot()
+
+    # bodies are cached pre-rendered, so a hit also skips serialisation
+    key = (kb.etag, *cache_key(message, language))
+    body = RESPONSE_CACHE.get(key)
+    if body is not None:
+        return body
+
+    # parsed once: the key matches memoised on each query serve every stage
+    questions = parse_questions(key[1], language, kb)
+    semantic = semantic_key(key[1], language, kb, questions)
+    if semantic is not None:
+        body = SEMANTIC_CACHE.get(language, kb.etag, *semantic)
+    if body is None:
+        body = answer(key[1], key[2], kb, questions)
+        # the LLM only rephrases; past its budget the rule-based answer is
+        # served, and not cached so the next request tries the LLM again
+        body, rephrased = await llm_service.simplify(body, req.message, reply_language(key[1], language))
+        if not rephrased and llm_service.enabled():
+            return body
+        if semantic is not None:
+            SEMANTIC_CACHE.set(language, kb.etag, *semantic, body)
+    RESPONSE_CACHE.set(key, body)
+    return body
+
+
+@router.post("/batch", response_model=List[ChatResponse])
+async def chat_batch(reqs: List[ChatRequest]):
+    if len(reqs) > MAX_BATCH:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BATCH} messages per batch")
+
+    started = time.perf_counter()
+    kb = snapshot()
+    keys = [cache_key(normalize(r.message), request_language(r.language)) for r in reqs]
+
+    # identical messages inside the batch are answered once
+    bodies = {}
+    for key in keys:
+        if key not in bodies:
+            bodies[key] = RESPONSE_CACHE.get((kb.etag, *key))
+
+    # batch answers are rule-based only; with the LLM on, caching them would
+    # stop chat_body from ever rephrasing the same message
+    missing = [key for key, body in bodies.items() if body is None]
+    cache = not llm_service.enabled()
+    for key, body in zip(missing, answer_many(missing, kb)):
+        bodies[key] = body
+        if cache:
+            RESPONSE_CACHE.set((kb.etag, *key), body)
+
+    body = b"[" + b",".join(bodies[key] for key in keys) + b"]"
+    BATCH_SECONDS.observe(time.perf_counter() - started)
+    return json_response(body)
+
+
+@router.post("/stream")
+async def chat_stream(req: ChatRequest):
+    key = cache_key(normalize(req.message), request_language(req.language))
+    return StreamingResponse(
+        stream_answer(*key, snapshot()),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/cache")
+def cache_stats():
+    return {**RESPONSE_CACHE.stats(), "semantic": SEMANTIC_CACHE.stats()}
+
+
+@router.get("/llm")
+def llm_stats():
+    return llm_service.CLIENT.stats() if llm_service.enabled() else {"enabled": False}
+
+
+def answer(message: str, language: str, kb: KnowledgeBase | None = None, questions=None) -> bytes:
+    """Rendered ChatResponse JSON for an already-normalised message."""
+    return answer_many([(message, language)], kb, None if questions is None else [questions])[0]
+
+
+def resolve(q: ParsedQuery, ranked, kb: KnowledgeBase, profile_text=None):
+    """
+    (answer text, confidence, steps) for one question fragment, or None.
+    profile_text is where an eligibility question reads the user's profile
+    from (default: the fragment itself).
+    """
+    intent = ranked[0][0] if ranked else "unknown"
+    if intent == "office_locator":
+        return locate_offices(q, kb)
+    if intent == "eligibility_check":
+        return check_eligibility(q, kb, profile_text)
+
+    kind = INTENT_KINDS.get(intent)
+    if kind is None:
+        return None
+
+    # prefer the kind the intent asks for, else the best hit of any kind
+    hits = kb.search(q, k=1, kind=kind) or kb.search(q, k=1)
+    if not hits:
+        return None
+    hit = hits[0]
+    if hit.score < (MIN_SCORE if (hit.kind, hit.key) in kb.named(q) else MIN_FIELD_SCORE):
+        return None
+
+    # answer text and steps were rendered when the KB was loaded
+    fragments = kb.fragments(hit.kind, hit.key, q.language)
+    return fragments.answer, score_to_confidence(hit.score), fragments.steps
+
+
+def locate_offices(q: ParsedQuery, kb: KnowledgeBase):
+    office_type = office_type_for(q.tokens)
+    label = template(q.language, f"office_{office_type or 'any'}")
+
+    pincode = PINCODE_RE.search(q.text)
+    if pincode:
+        found = kb.nearest_offices(pincode.group(), 3, office_type)
+        if found:
+            return (
+                template(q.language, "nearest_offices").format(label=label, pincode=pincode.group()) + "\n" +
+                "\n".join(f"- {o['name']}, {o['address']} ({d} km)" for d, o in found),
+                0.9,
+                (),
+            )
+        # asking for a pincode again is no help: say why none were found
+        reason = "no_offices" if kb.locate_pincode(pincode.group()) else "unknown_pincode"
+        return template(q.language, reason).format(label=label, pincode=pincode.group()), 0.6, ()
+
+    # no pincode: name the office of a KB entry the user mentions
+    for kind, keys in (("document", kb.find_documents(q)), ("scheme", kb.find_schemes(q))):
+        if keys:
+            office = kb.fragments(kind, keys[0], q.language).office
+            if office:
+                return office, 0.7, ()
+
+    return template(q.language, "ask_pincode").format(label=label), 0.5, ()
+
+
+def check_eligibility(q: ParsedQuery, kb: KnowledgeBase, profile_text=None):
+    # a named scheme: its own eligibility list
+    for key in kb.find_schemes(q):
+        text = kb.fragments("scheme", key, q.language).eligibility
+        if text:
+            return text, 0.8, ()
+
+    # else the schemes matching whatever profile the message states
+    profile = profile_from_text(profile_text or q.text, kb.eligibility_index.states())
+    if not profile:
+        return template(q.language, "ask_profile"), 0.5, ()
+    count, keys = kb.eligible_schemes(MAX_ELIGIBLE, **profile)
+    if not count:
+        return template(q.language, "not_eligible"), 0.6, ()
+
+    names = [kb.fragments("scheme", key, q.language).name for key in keys]
+    if count > len(keys):
+        names.append(template(q.language, "more").format(n=count - len(keys)))
+    return template(q.language, "eligible") + "\n" + "\n".join(f"- {n}" for n in names), 0.7, ()
+
+
+def states_profile(q: ParsedQuery, ranked, kb: KnowledgeBase):
+    """
+    True for a fragment that only states the user's profile ("i am 30 with
+    income 2 lakh"). Next to an eligibility question it is part of that
+    question, not one of its own.
+    """
+    if ranked and ranked[0][0] == "eligibility_check":
+        return False
+    if kb.find_documents(q) or kb.find_schemes(q):
+        return False
+    return bool(profile_from_text(q.text, kb.eligibility_index.states()))
+
+
+def resolve_fragments(keys, owners, questions, rankings, kb: KnowledgeBase):
+    """
+    Yield (owner, resolve() result or None) for each fragment, in order:
+    the one per-fragment loop behind answer_many() and the stream. A
+    message with an eligibility question is read whole for the profile,
+    and its fragments that only state one are skipped. Each distinct
+    fragment is looked up once.
+    """
+    eligibility = {i for i, ranked in zip(owners, rankings) if ranked and ranked[0][0] == "eligibility_check"}
+    resolved = {}                    # (text, language, profile text) -> resolve() result
+
+    for i, q, ranked in zip(owners, questions, rankings):
+        QUESTIONS.labels(ranked[0][0] if ranked else "unknown", q.language).inc()
+        profile_text = keys[i][0] if i in eligibility else None
+        if profile_text is not None and states_profile(q, ranked, kb):
+            continue
+        memo = (q.text, q.language, profile_text)
+        if memo not in resolved:
+            resolved[memo] = resolve(q, ranked, kb, profile_text)
+        yield i, resolved[memo]
+
+
+def answer_many(keys, kb: KnowledgeBase | None = None, parsed=None) -> list[bytes]:
+    """
+    Batched answer(): every message is split first, then all fragments are
+    classified in one detect_intents call and each distinct fragment is
+    looked up once. parsed optionally holds each message's
+    parse_questions() already.
+    """
+    kb = kb or snapshot()
+    bodies = [None] * len(keys)
+    started = time.perf_counter()
 
     # -------------------------
     # GREETING (NO LLM)
     # -------------------------
-    if message in ["hi", "hello", "hey", "namaste", "नमस्ते"]:
-        if language == "hi":
-            return ChatResponse(
-                mode="answer",
-                intent="unknown",
-                language="hi",
-                answer=(
-                    "नमस्ते! 👋 मैं SahajAI हूँ।\n\n"
-                    "मैं आपकी मदद कर सकता हूँ:\n"
-                    "• सरकारी योजनाओं की जानकारी\n"
-                    "• आवश्यक दस्तावेज़\n"
-                    "• कार्यालय मार्गदर्शन (तहसील, CSC, जन सेवा केंद्र)\n"
-                    "• फ़ॉर्म भरने के चरण\n\n"
-                    "आप क्या जानना चाहते हैं?"
-                ),
-                confidence=0.9
-            )
-
-        return ChatResponse(
-            mode="answer",
-            intent="unknown",
-            language="en",
-            answer=(
-                "Hello! 👋 I’m SahajAI.\n\n"
-                "I can help you with:\n"
-                "• Government schemes\n"
-                "• Required documents\n"
-                "• Office guidance (Tehsil, CSC, Jan Seva Kendra)\n"
-                "• Step-by-step form filling\n\n"
-                "How can I assist you today?"
-            ),
-            confidence=0.9
-        )
+    keys = [(message, reply_language(message, language)) for message, language in keys]
+    for i, (message, language) in enumerate(keys):
+        if message in GREETINGS:
+            bodies[i] = constant_body("greeting", language)
+            ANSWERS.labels("answer", language).inc()
 
     # -------------------------
     # MULTI-QUESTION HANDLING
     # -------------------------
-    questions = split_questions(message)
-    answers = set()  # 🔑 use set to avoid duplicates
+    # each fragment is parsed once and shared by every stage below
+    owners, questions = [], []
+    for i, (message, language) in enumerate(keys):
+        if bodies[i] is None:
+            for q in parse_questions(message, language, kb) if parsed is None else parsed[i]:
+                owners.append(i)
+                questions.append(q)
 
-    for q in questions:
-        intent = detect_intent(q)
+    answers = [set() for _ in keys]  # 🔑 use set to avoid duplicates
+    confidences = [[] for _ in keys]
+    steps = [{} for _ in keys]       # dict as an ordered set
+
+    split_done = time.perf_counter()
+    SPLIT_SECONDS.observe(split_done - started)
+    rankings = detect_intents(questions)
+    intents_done = time.perf_counter()
+    INTENT_SECONDS.observe(intents_done - split_done)
 
-        if intent == "document_help":
-            key, data = get_document_info(q)
-            if data:
-                answers.add(
-                    f"Documents required for {key.title()}:\n" +
-                    "\n".join(f"- {d}" for d in data["documents"])
-                )
+    for i, result in resolve_fragments(keys, owners, questions, rankings, kb):
+        if result is not None:
+            answers[i].add(result[0])
+            confidences[i].append(result[1])
+            steps[i].update(dict.fromkeys(result[2]))
 
-        elif intent == "scheme_info":
-            key, data = get_scheme_info(q)
-            if data:
-                answers.add(data["description"])
+    LOOKUP_SECONDS.observe(time.perf_counter() - intents_done)
 
+    for i, (message, language) in enumerate(keys):
+        if bodies[i] is None:
+            bodies[i] = compose(answers[i], confidences[i], list(steps[i]), language)
+
+    return bodies
+
+
+def compose(answers, confidences, steps, language: str) -> bytes:
     # ✅ RETURN COMBINED ANSWER
+    # confidence is that of the weakest sub-answer
     if answers:
-        return ChatResponse(
+        started = time.perf_counter()
+        response = ChatResponse(
             mode="answer",
             intent="multi",
             language=language,
             answer="\n\n".join(sorted(answers)),
-            confidence=0.8
+            steps=steps,
+            confidence=min(confidences)
         )
+        built = time.perf_counter()
+        body = render(response)
+        BUILD_SECONDS.observe(built - started)
+        SERIALIZE_SECONDS.observe(time.perf_counter() - built)
+        ANSWERS.labels("answer", language).inc()
+        return body
 
     # -------------------------
     # FINAL FALLBACK (BILINGUAL)
     # -------------------------
-    if language == "hi":
-        return ChatResponse(
-            mode="fallback",
-            intent="unknown",
-            language="hi",
-            answer=(
-                "माफ़ कीजिए, मुझे इस प्रश्न की सटीक जानकारी नहीं मिली।\n"
-                "कृपया सरकारी योजनाओं, दस्तावेज़ों या कार्यालयों से संबंधित प्रश्न पूछें।"
-            ),
-            confidence=0.3
-        )
+    ANSWERS.labels("fallback", language).inc()
+    return constant_body("fallback", language)
 
-    return ChatResponse(
-        mode="fallback",
-        intent="unknown",
-        language="en",
-        answer=(
-            "Sorry, I couldn’t find exact information for this query.\n"
-            "Please ask about government schemes, documents, or offices."
-        ),
-        confidence=0.3
-    )
+
+# -------------------------
+# STREAMING (SSE)
+# -------------------------
+
+def sse(event: str, data) -> bytes:
+    if not isinstance(data, bytes):
+        data = json.dumps(data, ensure_ascii=False).encode("utf-8")
+    return b"event: " + event.encode() + b"\ndata: " + data + b"\n\n"
+
+
+async def stream_answer(message: str, language: str, kb: KnowledgeBase):
+    """
+    Emit one `answer` event per distinct sub-answer as soon as it is
+    resolved, then a `done` event carrying the full ChatResponse. Every
+    event reports elapsed_ms since the request started, so time to first
+    answer can be read straight off the stream.
+    """
+    start = time.perf_counter()
+
+    def elapsed():
+        return round((time.perf_counter() - start) * 1e3, 3)
+
+    key = (kb.etag, message, language)
+    body = RESPONSE_CACHE.get(key)
+    language = reply_language(message, language)
+
+    if body is None and message in GREETINGS:
+        body = constant_body("greeting", language)
+
+    if body is None:
+        answers, confidences, steps = set(), [], {}
+        questions = parse_questions(message, language, kb)
+        owners = [0] * len(questions)
+        fragments = resolve_fragments([(message, language)], owners, questions, detect_intents(questions), kb)
+
+        # gathered exactly as answer_many() does, so `done` matches POST /api/chat/
+        for _, result in fragments:
+            if result is None:
+                continue
+            repeat = result[0] in answers
+            answers.add(result[0])
+            confidences.append(result[1])
+            steps.update(dict.fromkeys(result[2]))
+            if repeat:
+                continue
+            yield sse("answer", {
+                "index": len(answers) - 1,
+                "answer": result[0],
+                "steps": list(result[2]),
+                "confidence": result[1],
+                "elapsed_ms": elapsed(),
+            })
+
+        body = compose(answers, confidences, list(steps), language)
+
+    if not llm_service.enabled():     # rule-based only, see chat_batch
+        RESPONSE_CACHE.set(key, body)
+    yield sse("done", b'{"elapsed_ms":%s,"response":%s}' % (str(elapsed()).encode(), body))
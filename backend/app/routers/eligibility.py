@@ -0,0 +1,23 @@
+from fastapi import APIRouter
+
+from app.schemas.eligibility import EligibilityProfile, EligibilityResponse, EligibleScheme
+from app.services.knowledge_service import snapshot
+
+router = APIRouter(prefix="/api/eligibility", tags=["eligibility"])
+
+MAX_RESULTS = 100
+
+
+@router.post("/", response_model=EligibilityResponse)
+def eligible_schemes(profile: EligibilityProfile, limit: int = MAX_RESULTS):
+    kb = snapshot()
+    language = profile.language or "en"
+    count, keys = kb.eligible_schemes(
+        max(0, min(limit, MAX_RESULTS)), **profile.model_dump(exclude={"language"}),
+    )
+
+    schemes = []
+    for key in keys:
+        fragments = kb.fragments("scheme", key, language)
+        schemes.append(EligibleScheme(key=key, name=fragments.name, eligibility=fragments.eligibility))
+    return EligibilityResponse(count=count, schemes=schemes)
@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from typing import List
+
+class EligibilityProfile(BaseModel):
+    # fields left out do not filter
+    citizen: bool | None = None
+    annual_income: int | None = None
+    owns_pucca_house: bool | None = None
+    state: str | None = None
+    age: int | None = None
+    language: str | None = "en"
+
+class EligibleScheme(BaseModel):
+    key: str
+    name: str
+    eligibility: str = ""
+
+class EligibilityResponse(BaseModel):
+    count: int
+    schemes: List[EligibleScheme]
@@ -0,0 +1,183 @@
+"""
+Pre-rendered answer fragments for every KB entry, in every supported
+language.
+
+The text a chat answer is made of (the document list, the eligibility
+list, "visit <office>", the numbered pathway steps) depends only on the
+entry, so it is formatted once when the KB is built or reloaded instead of
+on every request. Answer assembly in the chat router is then a lookup and
+a join.
+
+Entries may carry a "translations" object, e.g.
+    "translations": {"hi": {"name": "...", "documents": [...], "office": "..."}}
+and any field missing from it falls back to the English one.
+"""
+
+from array import array
+from typing import NamedTuple
+
+from app.utils.binary_store import Lookup
+
+LANGUAGES = ("en", "hi")
+
+TEMPLATES = {
+    "en": {
+        "documents": "Documents required for {name}:",
+        "eligibility": "Eligibility for {name}:",
+        "office": "{name}: visit {office}.\nShare your 6-digit pincode to find the nearest one.",
+        "no_offices": "We have no {label} listed near pincode {pincode} yet.",
+        "unknown_pincode": "We can't locate pincode {pincode} yet, so we can't list the nearest {label}.",
+        "nearest_offices": "Nearest {label} for {pincode}:",
+        "ask_pincode": "Please share your 6-digit pincode to find the nearest {label}.",
+        # office type (see office_service.OFFICE_TYPES) -> its name in replies
+        "office_any": "offices",
+        "office_csc": "CSC",
+        "office_tehsil": "Tehsil office",
+        "office_aadhaar": "Aadhaar Seva Kendra",
+        "step": "{i}. Get {name}",
+        "step_office": "{i}. Get {name} ({office})",
+        "eligible": "Schemes you may be eligible for:",
+        "more": "...and {n} more",
+        "not_eligible": "No scheme matches the details you shared.",
+        "ask_profile": (
+            "Share your age, annual income, state and whether you own a pucca house "
+            "to find the schemes you are eligible for."
+        ),
+    },
+    "hi": {
+        "documents": "{name} के लिए आवश्यक दस्तावेज़:",
+        "eligibility": "{name} के लिए पात्रता:",
+        "office": "{name}: {office} पर जाएँ।\nनज़दीकी केंद्र जानने के लिए अपना 6 अंकों का पिनकोड बताएँ।",
+        "no_offices": "पिनकोड {pincode} के आसपास का कोई {label} अभी हमारी सूची में नहीं है।",
+        "unknown_pincode": "पिनकोड {pincode} की जगह हमें अभी पता नहीं है, इसलिए नज़दीकी {label} नहीं बता सकते।",
+        "nearest_offices": "पिनकोड {pincode} के नज़दीकी {label}:",
+        "ask_pincode": "नज़दीकी {label} जानने के लिए अपना 6 अंकों का पिनकोड बताएँ।",
+        "office_any": "कार्यालय",
+        "office_csc": "CSC केंद्र",
+        "office_tehsil": "तहसील कार्यालय",
+        "office_aadhaar": "आधार सेवा केंद्र",
+        "step": "{i}. {name} बनवाएँ",
+        "step_office": "{i}. {name} बनवाएँ ({office})",
+        "eligible": "आप इन योजनाओं के पात्र हो सकते हैं:",
+        "more": "...और {n} योजनाएँ",
+        "not_eligible": "आपके बताए विवरण से कोई योजना मेल नहीं खाती।",
+        "ask_profile": (
+            "अपनी उम्र, वार्षिक आय, राज्य और क्या आपके पास पक्का मकान है, बताएँ, "
+            "ताकि हम आपके लिए योजनाएँ ढूँढ सकें।"
+        ),
+    },
+}
+
+
+class Fragments(NamedTuple):
+    name: str              # display name
+    answer: str            # reply when the entry is the best search hit
+    eligibility: str       # "" when the entry lists none
+    office: str            # "" when the entry names no office
+    steps: tuple           # numbered pathway, prerequisites first
+
+
+EMPTY = Fragments("", "", "", "", ())
+
+
+def template(language, name):
+    return (TEMPLATES.get(language) or TEMPLATES["en"])[name]
+
+
+def _localized(key, value, language):
+    """(display name, field getter) for an entry in one language."""
+    translated = value.get("translations", {}).get(language, {}) if language != "en" else {}
+
+    def field(name, default=None):
+        found = translated.get(name)
+        return found if found else value.get(name, default)
+
+    return translated.get("name") or key.title(), field
+
+
+def _bulleted(header, items):
+    return header + "\n" + "\n".join(f"- {item}" for item in items)
+
+
+def render(kind, key, value, pathway, documents, language):
+    """Fragments of one entry; pathway is its dependency-ordered documents."""
+    t = TEMPLATES[language]
+    name, field = _localized(key, value, language)
+
+    if kind == "document":
+        answer = _bulleted(t["documents"].format(name=name), field("documents", ()))
+    else:
+        answer = field("description", "")
+
+    eligibility = field("eligibility", ())
+    eligibility = _bulleted(t["eligibility"].format(name=name), eligibility) if eligibility else ""
+
+    office = field("office")
+    office = t["office"].format(name=name, office=office) if office else ""
+
+    steps = []
+    for i, document in enumerate(pathway, 1):
+        step_name, step_field = _localized(document, documents[document], language)
+        step_office = step_field("office")
+        line = t["step_office"] if step_office else t["step"]
+        steps.append(line.format(i=i, name=step_name, office=step_office))
+
+    return Fragments(name, answer, eligibility, office, tuple(steps))
+
+
+class AnswerFragments:
+    """
+    Fragments of every entry per language, as string lists indexed by entry
+    id (steps in CSR form), so they round-trip through to_arrays().
+    """
+
+    def __init__(self, documents, schemes, graph):
+        self._entries = Lookup()                     # "kind:key" -> entry id
+        self._languages = {
+            language: {
+                "names": [], "answers": [], "eligibility": [], "offices": [],
+                "step_offsets": array("I", [0]), "steps": [],
+            }
+            for language in LANGUAGES
+        }
+
+        for kind, entries, pathway in (
+            ("document", documents, graph.prerequisites),
+            ("scheme", schemes, graph.pathway),
+        ):
+            for key, value in entries.items():
+                self._entries[f"{kind}:{key}"] = len(self._entries)
+                path = pathway(key)
+                for language, columns in self._languages.items():
+                    fragments = render(kind, key, value, path, documents, language)
+                    columns["names"].append(fragments.name)
+                    columns["answers"].append(fragments.answer)
+                    columns["eligibility"].append(fragments.eligibility)
+                    columns["offices"].append(fragments.office)
+                    columns["steps"].extend(fragments.steps)
+                    columns["step_offsets"].append(len(columns["steps"]))
+
+    def to_arrays(self):
+        return {"entries": self._entries, "languages": self._languages}
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        self = cls.__new__(cls)
+        self._entries = arrays["entries"]
+        self._languages = arrays["languages"]
+        return self
+
+    def get(self, kind, key, language="en"):
+        """Fragments of an entry; unsupported languages get the English ones."""
+        entry_id = self._entries.get(f"{kind}:{key}")
+        if entry_id is None:
+            return EMPTY
+        columns = self._languages.get(language) or self._languages["en"]
+        offsets = columns["step_offsets"]
+        return Fragments(
+            columns["names"][entry_id],
+            columns["answers"][entry_id],
+            columns["eligibility"][entry_id],
+            columns["offices"][entry_id],
+            tuple(columns["steps"][offsets[entry_id]:offsets[entry_id + 1]]),
+        )
@@ -0,0 +1,134 @@
+"""
+Document dependency engine: scheme -> required documents -> prerequisite
+documents.
+
+Documents and schemes are numbered nodes of one graph whose adjacency is
+stored in CSR form (an offsets array plus a flat targets array). Cycles
+are detected and their closing edges dropped, then the topologically
+ordered pathway of every node is precomputed (again as CSR), so pathway()
+and prerequisites() are a hash lookup plus a slice on the request path. All state
+is arrays and string lists, so it round-trips through to_arrays().
+"""
+
+import logging
+from array import array
+
+from app.utils.binary_store import Lookup
+
+logger = logging.getLogger(__name__)
+
+
+class DependencyGraph:
+    def __init__(self, documents, schemes):
+        # node ids: documents first, then schemes
+        self.nodes = list(documents)
+        doc_ids = {name: i for i, name in enumerate(self.nodes)}
+        n_docs = len(self.nodes)
+        self.nodes += list(schemes)
+
+        requires = [documents[name].get("prerequisites", []) for name in documents]
+        requires += [schemes[name].get("documents", []) for name in schemes]
+
+        self.offsets = array("I", [0])
+        self.targets = array("I")
+        for node, names in enumerate(requires):
+            for name in names:
+                target = doc_ids.get(name)
+                if target is None:
+                    logger.warning("%s requires unknown document %r", self.nodes[node], name)
+                    continue
+                self.targets.append(target)
+            self.offsets.append(len(self.targets))
+
+        self.cycles = []
+        order = self._topological_order()
+
+        # pathway of a node = its transitive prerequisites, prerequisites first
+        position = {node: i for i, node in enumerate(order)}
+        closures = [None] * len(self.nodes)
+        for node in order:
+            reach = set()
+            for target in self._edges(node):
+                if position[target] < position[node]:
+                    reach.add(target)
+                    reach |= closures[target]
+            closures[node] = reach
+
+        self._documents = Lookup(doc_ids)                  # name -> node id
+        self._schemes = Lookup((name, n_docs + i) for i, name in enumerate(schemes))
+        self._pathway_offsets = array("I", [0])            # node -> slice of _pathways
+        self._pathways = array("I")
+        for node in range(len(self.nodes)):
+            self._pathways.extend(sorted(closures[node], key=position.__getitem__))
+            self._pathway_offsets.append(len(self._pathways))
+
+    def _edges(self, node):
+        return self.targets[self.offsets[node]:self.offsets[node + 1]]
+
+    def _topological_order(self):
+        """Iterative DFS post-order; edges back into the stack are cycles."""
+        WHITE, GREY, BLACK = 0, 1, 2
+        colour = bytearray(len(self.nodes))
+        order = []
+
+        for root in range(len(self.nodes)):
+            if colour[root] != WHITE:
+                continue
+            colour[root] = GREY
+            stack = [(root, iter(self._edges(root)))]
+            while stack:
+                node, edges = stack[-1]
+                for target in edges:
+                    if colour[target] == WHITE:
+                        colour[target] = GREY
+                        stack.append((target, iter(self._edges(target))))
+                        break
+                    if colour[target] == GREY:
+                        path = [n for n, _ in stack]
+                        cycle = [self.nodes[n] for n in path[path.index(target):]]
+                        self.cycles.append(" -> ".join(cycle + [cycle[0]]))
+                        logger.warning("document dependency cycle: %s", self.cycles[-1])
+                else:
+                    colour[node] = BLACK
+                    order.append(node)
+                    stack.pop()
+        return order
+
+    def to_arrays(self):
+        return {
+            "nodes": self.nodes,
+            "offsets": self.offsets,
+            "targets": self.targets,
+            "cycles": self.cycles,
+            "documents": self._documents,
+            "schemes": self._schemes,
+            "pathway_offsets": self._pathway_offsets,
+            "pathways": self._pathways,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        self = cls.__new__(cls)
+        self.nodes = arrays["nodes"]
+        self.offsets = arrays["offsets"]
+        self.targets = arrays["targets"]
+        self.cycles = arrays["cycles"]
+        for name in ("documents", "schemes", "pathway_offsets", "pathways"):
+            setattr(self, f"_{name}", arrays[name])
+        return self
+
+    # -----------------------
+    # Lookups (O(1))
+    # -----------------------
+
+    def _slice(self, node):
+        if node is None:
+            return range(0)
+        return range(self._pathway_offsets[node], self._pathway_offsets[node + 1])
+
+    def pathway(self, scheme):
+        """Every document a scheme needs, in the order they must be obtained."""
+        return tuple(self.nodes[self._pathways[i]] for i in self._slice(self._schemes.get(scheme)))
+
+    def prerequisites(self, document):
+        return tuple(self.nodes[self._pathways[i]] for i in self._slice(self._documents.get(document)))
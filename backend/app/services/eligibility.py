@@ -0,0 +1,277 @@
+"""
+Eligibility rules compiled into bitsets over schemes.
+
+Each free-text eligibility line of a scheme is parsed into a typed
+predicate (citizenship, annual income, pucca house ownership, state of
+residence, age). Every predicate is then compiled into Python-int bitsets
+with bit i standing for scheme i:
+
+  * boolean predicates: the schemes that require them;
+  * state: the schemes restricted to some state, and per state the schemes
+    open to its residents;
+  * income and age: the value axis is cut at every threshold any scheme
+    uses, and each band between two cuts gets the bitset of schemes that
+    accept a value in it.
+
+Answering a profile is then one bitset per field the profile gives and an
+AND over them, whatever the number of schemes. Fields the profile leaves
+out do not filter, and lines that do not parse are not enforced.
+"""
+
+import logging
+import re
+from array import array
+from bisect import bisect_right
+
+from app.utils.binary_store import Lookup
+
+logger = logging.getLogger(__name__)
+
+NUMERIC_FIELDS = ("annual_income", "age")
+UNBOUNDED = 1 << 62
+
+_UNITS = {"lakh": 100_000, "lac": 100_000, "lakhs": 100_000, "crore": 10_000_000, "k": 1_000, "thousand": 1_000}
+_AMOUNT = r"(?:rs\.?|inr|₹)?\s*(\d[\d,]*(?:\.\d+)?)\s*(lakhs?|lac|crore|k|thousand)?"
+
+_CITIZEN_RE = re.compile(r"\bindian (?:citizen|national)")
+_NO_HOUSE_RE = re.compile(r"\b(?:does not|doesn't|do not|don't|not|no)\s+(?:own\s+)?(?:a |any )?(?:pucca|pakka|permanent) (?:house|home)")
+_INCOME_BELOW_RE = re.compile(r"income (below|under|less than|up to|upto|not exceeding|not more than|of at most)\s*" + _AMOUNT)
+_INCOME_ABOVE_RE = re.compile(r"income (above|over|more than|at least)\s*" + _AMOUNT)
+_AGE_RANGE_RE = re.compile(r"\baged? (?:between |from )?(\d{1,3})\s*(?:-|to|and)\s*(\d{1,3})")
+_AGE_MIN_RE = re.compile(r"\b(?:aged? (\d{1,3})\s*(?:years )?(?:or|and) (?:above|older|more)|(?:above|over) (?:the )?age (?:of )?(\d{1,3}))")
+_AGE_MAX_RE = re.compile(r"\b(?:aged? (\d{1,3})\s*(?:years )?(?:or|and) (?:below|younger|less)|(?:below|under) (?:the )?age (?:of )?(\d{1,3}))")
+_STATE_RE = re.compile(r"\b(?:resident|residents|domicile|domiciled) (?:of|in) ([a-z][a-z &,]*)")
+_STATE_SPLIT_RE = re.compile(r"\s*(?:,| or | and | & )\s*")
+
+# profile fields stated in a chat message ("i am 34, income 2 lakh, from bihar")
+_SAID_AGE_RE = re.compile(r"\b(?:(?:age(?:d| is)?|i am|i'm)\s*(\d{1,3})\b(?!\s*(?:lakh|lac|k|thousand|crore))|(\d{1,3})\s*(?:years?|yrs?|saal|साल|वर्ष)\b)")
+_SAID_INCOME_RE = re.compile(r"\b(?:income|earn\w*|salary|kamai|आय|कमाई)\D{0,15}?" + _AMOUNT.replace("(lakhs?|", "(लाख|lakhs?|"))
+_SAID_NO_HOUSE_RE = re.compile(r"\b(?:no|not|don't|do not|dont|without)\s+(?:own\s+|have\s+)?(?:a |any )?(?:pucca |pakka |permanent )?(?:house|home|ghar)")
+_SAID_HOUSE_RE = re.compile(r"\b(?:own|have) (?:a |my own )?(?:pucca |pakka |permanent )?(?:house|home|ghar)")
+_SAID_NOT_CITIZEN_RE = re.compile(r"\bnot (?:an? )?indian\b|\bforeign (?:national|citizen)")
+
+
+def _rupees(number, unit):
+    return int(float(number.replace(",", "")) * _UNITS.get(unit or "", 1))
+
+
+def profile_from_text(text, states=()):
+    """Profile fields a message states; states are the names the index knows."""
+    profile = {}
+    m = _SAID_AGE_RE.search(text)
+    if m:
+        profile["age"] = int(m.group(1) or m.group(2))
+    m = _SAID_INCOME_RE.search(text)
+    if m:
+        unit = "lakh" if m.group(2) == "लाख" else m.group(2)
+        profile["annual_income"] = _rupees(m.group(1), unit)
+    if _SAID_NO_HOUSE_RE.search(text):
+        profile["owns_pucca_house"] = False
+    elif _SAID_HOUSE_RE.search(text):
+        profile["owns_pucca_house"] = True
+    if _SAID_NOT_CITIZEN_RE.search(text):
+        profile["citizen"] = False
+    padded = f" {text} "
+    for state in states:
+        if f" {state} " in padded:
+            profile["state"] = state
+            break
+    return profile
+
+
+def parse_rule(line):
+    """
+    One eligibility line -> (field, value), or None if it is not understood.
+    Numeric values are half-open intervals [low, high).
+    """
+    text = " ".join(line.lower().split())
+    if _CITIZEN_RE.search(text):
+        return "citizen", True
+    if _NO_HOUSE_RE.search(text):
+        return "owns_pucca_house", False
+
+    m = _INCOME_BELOW_RE.search(text)
+    if m:
+        limit = _rupees(m.group(2), m.group(3))
+        inclusive = m.group(1) not in ("below", "under", "less than")
+        return "annual_income", (0, limit + 1 if inclusive else limit)
+    m = _INCOME_ABOVE_RE.search(text)
+    if m:
+        limit = _rupees(m.group(2), m.group(3))
+        return "annual_income", (limit if m.group(1) == "at least" else limit + 1, UNBOUNDED)
+
+    m = _AGE_RANGE_RE.search(text)
+    if m:
+        return "age", (int(m.group(1)), int(m.group(2)) + 1)
+    m = _AGE_MIN_RE.search(text)
+    if m:
+        if m.group(1):
+            return "age", (int(m.group(1)), UNBOUNDED)
+        return "age", (int(m.group(2)) + 1, UNBOUNDED)
+    m = _AGE_MAX_RE.search(text)
+    if m:
+        if m.group(1):
+            return "age", (0, int(m.group(1)) + 1)
+        return "age", (0, int(m.group(2)))
+
+    m = _STATE_RE.search(text)
+    if m:
+        states = frozenset(s.strip() for s in _STATE_SPLIT_RE.split(m.group(1)) if s.strip())
+        return "state", states
+    return None
+
+
+def compile_rules(lines):
+    """{field: value} for a scheme; repeated numeric limits are intersected."""
+    rules = {}
+    for line in lines:
+        rule = parse_rule(line)
+        if rule is None:
+            logger.debug("eligibility rule not understood: %r", line)
+            continue
+        field, value = rule
+        if field in NUMERIC_FIELDS and field in rules:
+            low, high = rules[field]
+            value = (max(low, value[0]), min(high, value[1]))
+        elif field == "state" and field in rules:
+            value = rules[field] & value
+        rules[field] = value
+    return rules
+
+
+_BITS = [tuple(i for i in range(8) if byte >> i & 1) for byte in range(256)]
+
+
+def _bitset(ids, n):
+    """Python int with the given bits set (built through a bytearray)."""
+    buf = bytearray((n + 7) // 8)
+    for i in ids:
+        buf[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buf, "little")
+
+
+class EligibilityIndex:
+    def __init__(self, schemes):
+        self.keys = list(schemes)
+        n = len(self.keys)
+        rules = [compile_rules(value.get("eligibility", ())) for value in schemes.values()]
+
+        bitsets = []
+
+        def add(ids):
+            bitsets.append(_bitset(ids, n))
+            return len(bitsets) - 1
+
+        def requiring(field, value):
+            return [i for i, r in enumerate(rules) if r.get(field) == value]
+
+        self._fields = {
+            "citizen": add(requiring("citizen", True)),
+            "owns_pucca_house": add(requiring("owns_pucca_house", False)),
+        }
+
+        # state: schemes restricted to some state, and per state those open to it
+        restricted = [i for i, r in enumerate(rules) if "state" in r]
+        states = sorted({s for i in restricted for s in rules[i]["state"]})
+        self._states = Lookup()
+        self._fields["state"] = add(restricted)
+        for state in states:
+            self._states[state] = add(i for i in restricted if state in rules[i]["state"])
+
+        # numeric fields: one bitset per band between consecutive cut points
+        self._bounds = {}
+        for field in NUMERIC_FIELDS:
+            limited = [i for i, r in enumerate(rules) if field in r]
+            cuts = sorted({v for i in limited for v in rules[i][field] if v < UNBOUNDED} | {0})
+            members = [[] for _ in cuts]
+            unlimited = [i for i, r in enumerate(rules) if field not in r]
+            for i in limited:
+                low, high = rules[i][field]
+                # band b covers [cuts[b], cuts[b + 1]); every value in it is accepted
+                for b in range(bisect_right(cuts, low) - 1, len(cuts)):
+                    if cuts[b] >= high:
+                        break
+                    members[b].append(i)
+            self._bounds[field] = array("q", cuts)
+            self._fields[field] = len(bitsets)
+            for ids in members:
+                add(ids + unlimited)
+
+        self._bitsets = bitsets
+        self.all = (1 << n) - 1
+        self.parsed = sum(len(r) for r in rules)
+
+    # -----------------------
+    # Snapshot round trip
+    # -----------------------
+
+    def to_arrays(self):
+        stride = (len(self.keys) + 7) // 8
+        return {
+            "keys": self.keys,
+            "stride": stride,
+            "count": len(self._bitsets),
+            "bitsets": array("B", b"".join(b.to_bytes(stride, "little") for b in self._bitsets)),
+            "fields": Lookup(self._fields),
+            "states": self._states,
+            "bounds": self._bounds,
+            "parsed": self.parsed,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        self = cls.__new__(cls)
+        self.keys = arrays["keys"]
+        stride, raw = arrays["stride"], arrays["bitsets"]
+        self._bitsets = [
+            int.from_bytes(raw[i * stride:(i + 1) * stride], "little") for i in range(arrays["count"])
+        ]
+        self._fields = arrays["fields"]
+        self._states = arrays["states"]
+        self._bounds = arrays["bounds"]
+        self.all = (1 << len(self.keys)) - 1
+        self.parsed = arrays["parsed"]
+        return self
+
+    # -----------------------
+    # Matching
+    # -----------------------
+
+    def states(self):
+        return list(self._states)
+
+    def mask(self, citizen=None, annual_income=None, owns_pucca_house=None, state=None, age=None):
+        """Bitset of the schemes a profile is eligible for; None fields do not filter."""
+        mask = self.all
+        if citizen is False:
+            mask &= ~self._bitsets[self._fields["citizen"]]
+        if owns_pucca_house:
+            mask &= ~self._bitsets[self._fields["owns_pucca_house"]]
+        if state:
+            allowed = self._states.get(state.strip().lower())
+            mask &= ~self._bitsets[self._fields["state"]] | (self._bitsets[allowed] if allowed is not None else 0)
+        for field, value in (("annual_income", annual_income), ("age", age)):
+            if value is not None:
+                band = bisect_right(self._bounds[field], max(value, 0)) - 1
+                mask &= self._bitsets[self._fields[field] + band]
+        return mask & self.all
+
+    def keys_of(self, mask, limit=None):
+        """Keys of the schemes set in a mask, in KB order, at most limit of them."""
+        keys = []
+        limit = len(self.keys) if limit is None else limit
+        for byte_index, byte in enumerate(mask.to_bytes((len(self.keys) + 7) // 8, "little")):
+            if byte:
+                base = byte_index * 8
+                keys.extend(self.keys[base + bit] for bit in _BITS[byte])
+                if len(keys) >= limit:
+                    return keys[:limit]
+        return keys
+
+    def match(self, limit=None, **profile):
+        """(number of eligible schemes, keys of the first limit of them)."""
+        mask = self.mask(**profile)
+        return mask.bit_count(), self.keys_of(mask, limit)
+
+    def __len__(self):
+        return len(self.keys)
@@ -1,25 +1,97 @@
-def detect_intent(message: str) -> str:
-    text = message.lower()
+import re
 
-    if any(k in text for k in ["scheme", "yojana", "pm", "ration"]):
-        return "scheme_info"
+from app.services.knowledge_service import load_json
+from app.utils.text import as_query
 
-    if any(k in text for k in ["document", "documents", "required", "aadhaar", "income"]):
-        return "document_help"
+# -----------------------
+# Intent keyword table
+# -----------------------
+# intents.json maps intent -> {keyword or two-word phrase: weight}. It is
+# compiled once into keyword -> ((intent index, weight), ...) so a message
+# is classified in one pass over its tokens, scoring every intent at once.
+# File order doubles as the tie-break priority.
 
-    if any(k in text for k in ["office", "where", "tehsil", "csc"]):
-        return "office_locator"
 
-    return "unknown"
-def split_questions(message: str):
-    # split by question words or punctuation
-    separators = ["?", " what ", " where ", " how "]
-    questions = [message]
+def compile_intents(table):
+    intents = list(table)
+    keywords = {}
+    for idx, intent in enumerate(intents):
+        for keyword, weight in table[intent].items():
+            keywords.setdefault(keyword.lower(), []).append((idx, float(weight)))
+    return intents, {k: tuple(v) for k, v in keywords.items()}
 
-    for sep in separators:
-        new = []
-        for q in questions:
-            new.extend(q.split(sep))
-        questions = new
 
-    return [q.strip() for q in questions if len(q.strip()) > 5]
+INTENTS, KEYWORDS = compile_intents(load_json("intents.json"))
+
+
+def rank_intents(query):
+    """Return [(intent, score), ...] best first; scores sum to 1."""
+    scores = [0.0] * len(INTENTS)
+    prev = None
+
+    for token in as_query(query).words:
+        for key in (token, f"{prev} {token}") if prev else (token,):
+            for idx, weight in KEYWORDS.get(key, ()):
+                scores[idx] += weight
+        prev = token
+
+    total = sum(scores)
+    if not total:
+        return []
+    ranked = sorted(
+        (i for i, s in enumerate(scores) if s),
+        key=lambda i: (-scores[i], i),
+    )
+    return [(INTENTS[i], round(scores[i] / total, 3)) for i in ranked]
+
+
+def detect_intents(queries):
+    """Batch form of rank_intents: one ranked list per query."""
+    return [rank_intents(q) for q in queries]
+
+
+def detect_intent(query) -> str:
+    ranked = rank_intents(query)
+    return ranked[0][0] if ranked else "unknown"
+
+
+# -----------------------
+# Question splitting
+# -----------------------
+# Sentence punctuation always splits, and so does a separator word between
+# two spaces. One precompiled alternation per language. Hindi places interrogatives right before
+# the verb ("आधार के लिए क्या चाहिए"), so splitting there would cut the subject
+# off; conjunctions mark the boundary between two questions instead.
+
+SPLIT_PUNCTUATION = "?।॥"
+SPLIT_WORDS = {
+    "en": ["what", "where", "how"],
+    "hi": ["what", "where", "how", "और", "तथा", "aur"],
+}
+
+
+def compile_splitter(words):
+    alternation = "|".join(re.escape(w) for w in words)
+    return re.compile(rf"[{re.escape(SPLIT_PUNCTUATION)}]|\s(?:{alternation})(?=\s)")
+
+
+SPLITTERS = {lang: compile_splitter(ws) for lang, ws in SPLIT_WORDS.items()}
+
+
+def iter_questions(message: str, language: str = "en"):
+    """Lazily yield the question fragments of message, in order."""
+    splitter = SPLITTERS.get(language, SPLITTERS["en"])
+    start = 0
+    for match in splitter.finditer(message):
+        fragment = message[start:match.start()].strip()
+        if len(fragment) > 5:
+            yield fragment
+        start = match.end()
+
+    fragment = message[start:].strip()
+    if len(fragment) > 5:
+        yield fragment
+
+
+def split_questions(message: str, language: str = "en"):
+    return list(iter_questions(message, language))
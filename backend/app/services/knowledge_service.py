@@ -1,9 +1,30 @@
+import hashlib
 import json
 import os
+import sys
+import threading
+import time
+
+from app.services.answer_fragments import AnswerFragments
+from app.services.dependency_graph import DependencyGraph
+from app.services.eligibility import EligibilityIndex
+from app.services.office_service import OfficeIndex
+from app.services.records import DocumentRecord, OfficeRecord, SchemeRecord, compact_entries
+from app.services.search_service import SearchIndex
+from app.services.transliteration import AliasTable
+from app.services.vector_service import VectorIndex
+from app.services.vector_service import prune as prune_vectors
+from app.utils.aho_corasick import AhoCorasick
+from app.utils.binary_store import JsonMap, Store, write_store
+from app.utils.text import DEVANAGARI_RE, ParsedQuery, as_query
 
 BASE_DIR = os.path.dirname(__file__)
 DATA_DIR = os.path.join(BASE_DIR, "..", "data")
 
+KB_FILES = ("documents.json", "schemes.json", "offices.json", "lexicon.json")
+SNAPSHOT_PATH = os.environ.get("SAHAJ_KB_SNAPSHOT", os.path.normpath(os.path.join(DATA_DIR, "kb.snapshot")))
+SNAPSHOT_FORMAT = 7
+
 
 def load_json(filename):
     path = os.path.join(DATA_DIR, filename)
@@ -13,21 +34,361 @@ def load_json(filename):
         return json.load(f)
 
 
-DOCUMENTS = load_json("documents.json")
-SCHEMES = load_json("schemes.json")
+def kb_etag():
+    """Content hash of the KB data files."""
+    digest = hashlib.sha1()
+    for filename in KB_FILES:
+        path = os.path.join(DATA_DIR, filename)
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                digest.update(filename.encode() + b"\0" + f.read())
+    return digest.hexdigest()[:16]
+
+
+# -----------------------
+# Snapshot
+# -----------------------
+# A KnowledgeBase holds the entries (compact records, see app.services.records)
+# plus every index derived from them and is never mutated once built. Keyword automata are built once here so
+# each lookup is a single pass over the message, independent of how many
+# keys the KB holds. Lookups accept either a raw message or a ParsedQuery;
+# the latter is what the chat router passes so the text is only normalised
+# once per request.
+
+class KnowledgeBase:
+    def __init__(self, version, etag, documents, schemes, offices, lexicon=None):
+        self.version = version
+        self.etag = etag
+        self.source = "json"
+        self.documents = documents
+        self.schemes = schemes
+
+        self.document_matcher = AhoCorasick(documents)
+        self.scheme_matcher = AhoCorasick(schemes)
+        self.search_index = SearchIndex(documents, schemes)
+        self.vector_index = VectorIndex.build(documents, schemes)
+        self.dependency_graph = DependencyGraph(documents, schemes)
+        self.office_index = OfficeIndex(offices)
+        self.alias_table = AliasTable(lexicon or {}, documents, schemes)
+        self.answer_fragments = AnswerFragments(documents, schemes, self.dependency_graph)
+        self.eligibility_index = EligibilityIndex(schemes)
+
+    def to_arrays(self):
+        return {
+            "documents": JsonMap.encode(self.documents),
+            "schemes": JsonMap.encode(self.schemes),
+            "document_matcher": self.document_matcher.to_arrays(),
+            "scheme_matcher": self.scheme_matcher.to_arrays(),
+            "search_index": self.search_index.to_arrays(),
+            "vector_index": self.vector_index.to_arrays(),
+            "dependency_graph": self.dependency_graph.to_arrays(),
+            "office_index": self.office_index.to_arrays(),
+            "alias_table": self.alias_table.to_arrays(),
+            "answer_fragments": self.answer_fragments.to_arrays(),
+            "eligibility_index": self.eligibility_index.to_arrays(),
+        }
+
+    @classmethod
+    def from_store(cls, version, store):
+        """Wrap an opened snapshot; every index is a view over its pages."""
+        arrays = store.tree
+        self = cls.__new__(cls)
+        self.version = version
+        self.etag = store.meta["etag"]
+        self.source = "snapshot"
+        self.documents = JsonMap.decode(arrays["documents"], DocumentRecord.from_dict)
+        self.schemes = JsonMap.decode(arrays["schemes"], SchemeRecord.from_dict)
+
+        self.document_matcher = AhoCorasick.from_arrays(arrays["document_matcher"])
+        self.scheme_matcher = AhoCorasick.from_arrays(arrays["scheme_matcher"])
+        self.search_index = SearchIndex.from_arrays(arrays["search_index"])
+        self.vector_index = VectorIndex.from_arrays(arrays["vector_index"])
+        self.dependency_graph = DependencyGraph.from_arrays(arrays["dependency_graph"])
+        self.office_index = OfficeIndex.from_arrays(arrays["office_index"])
+        self.alias_table = AliasTable.from_arrays(arrays["alias_table"])
+        self.answer_fragments = AnswerFragments.from_arrays(arrays["answer_fragments"])
+        self.eligibility_index = EligibilityIndex.from_arrays(arrays["eligibility_index"])
+        self._store = store
+        return self
+
+    def parse(self, text, language=None):
+        """
+        ParsedQuery for a normalised message, with Hindi / Hinglish phrases
+        rewritten to the English terms the indexes know.
+        """
+        language = "hi" if DEVANAGARI_RE.search(text) else language
+        return ParsedQuery(self.alias_table.rewrite(text), language)
+
+    def find_documents(self, query):
+        return self._find_keys(as_query(query), "document", self.document_matcher)
+
+    def find_schemes(self, query):
+        return self._find_keys(as_query(query), "scheme", self.scheme_matcher)
+
+    def _find_keys(self, query, kind, matcher):
+        """
+        Keys named in the query as typed, else through an alias or with typos
+        (see SearchIndex.match_keys). Memoised on the query: do not mutate.
+        """
+        def compute():
+            index = self.search_index
+            return matcher.find_all(query.text, True) or [
+                index.entry(entry_id)[1] for entry_id, _ in index.match_keys(query, kind)
+            ]
+        return query.memo((self, kind), compute)
+
+    def named(self, query, kind=None):
+        """{(kind, key), ...} of entries whose key or an alias the query names."""
+        index = self.search_index
+        return {index.entry(entry_id) for entry_id, _ in index.match_keys(query, kind)}
+
+    def search(self, query, k=5, kind=None):
+        """Top-k BM25 hits; kind restricts results to "document" or "scheme"."""
+        return self.search_index.search(query, k, kind)
+
+    def semantic_search(self, query, k=5, kind=None):
+        """Top-k entries by hashed n-gram cosine similarity; tolerant of paraphrase."""
+        return self.vector_index.search(query, k, kind)
+
+    def get_entry(self, kind, key):
+        return (self.schemes if kind == "scheme" else self.documents).get(key)
+
+    def pathway(self, scheme):
+        """Documents needed for a scheme, prerequisites first (precomputed)."""
+        return self.dependency_graph.pathway(scheme)
+
+    def fragments(self, kind, key, language="en"):
+        """Pre-rendered answer text of an entry (see app.services.answer_fragments)."""
+        return self.answer_fragments.get(kind, key, language)
+
+    def pathway_steps(self, kind, key, language="en"):
+        return self.answer_fragments.get(kind, key, language).steps
+
+    def eligible_schemes(self, limit=None, **profile):
+        """
+        (count, first limit keys) of the schemes whose eligibility rules a
+        profile meets (see app.services.eligibility).
+        """
+        return self.eligibility_index.match(limit, **profile)
+
+    def locate_pincode(self, pincode):
+        """(lat, lon) the office search starts from for a pincode, or None."""
+        return self.office_index.locate(pincode)
+
+    def nearest_offices(self, pincode, k=3, office_type=None):
+        """[(distance_km, office record), ...] closest to the pincode's location."""
+        return self.office_index.nearest_to_pincode(pincode, k, office_type)
+
+    def info(self):
+        return {
+            "version": self.version,
+            "etag": self.etag,
+            "source": self.source,
+            "documents": len(self.documents),
+            "schemes": len(self.schemes),
+            "offices": len(self.office_index),
+        }
+
+
+# -----------------------
+# Binary snapshot
+# -----------------------
+# `python -m app.services.knowledge_service` compiles the JSON files and
+# every index into one flat file (see app.utils.binary_store). Workers map
+# it instead of parsing and indexing the JSON, so startup does not grow
+# with the KB and all workers share the pages. The snapshot records the
+# etag (and file stats) of the JSON it was built from; if the JSON has
+# changed since, it is ignored and the KB is built from JSON as before.
+
+def build_snapshot(path=SNAPSHOT_PATH):
+    kb = _build_from_json(0, kb_etag())
+    meta = {"format": SNAPSHOT_FORMAT, "etag": kb.etag, "files": _file_stats(), "built_at": int(time.time())}
+    tmp = f"{path}.{os.getpid()}.tmp"
+    size = write_store(tmp, kb.to_arrays(), meta)
+    os.replace(tmp, path)
+    return kb, size
+
+
+def _open_snapshot(etag=None, path=SNAPSHOT_PATH):
+    """The snapshot Store if it exists and matches the JSON files, else None."""
+    if not os.path.exists(path):
+        return None
+    try:
+        store = Store(path)
+    except (OSError, ValueError) as exc:
+        print(f"⚠️ Ignoring KB snapshot {path}: {exc}")
+        return None
+
+    meta = store.meta
+    if meta.get("format") != SNAPSHOT_FORMAT:
+        return None
+    if etag is None:
+        # cheap stat check first; hash the files only when they were touched
+        if meta.get("files") == [list(st) if st else None for st in _file_stats()]:
+            return store
+        etag = kb_etag()
+    if meta.get("etag") != etag:
+        print(f"⚠️ KB snapshot {path} is stale, loading JSON")
+        return None
+    return store
+
+
+def _build_from_json(version, etag):
+    return KnowledgeBase(
+        version=version,
+        etag=etag,
+        documents=compact_entries(load_json("documents.json"), DocumentRecord),
+        schemes=compact_entries(load_json("schemes.json"), SchemeRecord),
+        offices=[OfficeRecord.from_dict(o) for o in load_json("offices.json") or []],
+        lexicon=load_json("lexicon.json"),
+    )
+
+
+# -----------------------
+# Load & reload
+# -----------------------
+# The live snapshot is a single module reference. reload() builds a new one
+# completely off to the side and then swaps the reference, so a request that
+# grabbed snapshot() keeps a consistent view until it finishes. Anything
+# derived from the KB (e.g. response caches) registers with on_reload().
+
+_SNAPSHOT = None
+_RELOAD_LOCK = threading.Lock()
+_RELOAD_HOOKS = []
+
 
+def on_reload(hook):
+    _RELOAD_HOOKS.append(hook)
+    return hook
 
-def get_document_info(message: str):
-    text = message.lower()
-    for key, value in DOCUMENTS.items():
-        if key in text:
-            return key, value
+
+def snapshot() -> KnowledgeBase:
+    return _SNAPSHOT
+
+
+def reload(force: bool = True) -> KnowledgeBase:
+    """Rebuild from the data files; unless forced, only when their content changed."""
+    global _SNAPSHOT
+
+    with _RELOAD_LOCK:
+        version = (_SNAPSHOT.version + 1) if _SNAPSHOT else 1
+        if _SNAPSHOT is None:
+            # startup: map the compiled snapshot when it is current
+            store = _open_snapshot()
+            if store is not None:
+                _SNAPSHOT = KnowledgeBase.from_store(version, store)
+                prune_vectors()
+                return _SNAPSHOT
+
+        etag = kb_etag()
+        if not force and _SNAPSHOT is not None and _SNAPSHOT.etag == etag:
+            return _SNAPSHOT
+
+        store = _open_snapshot(etag)
+        if store is not None:
+            kb = KnowledgeBase.from_store(version, store)
+        else:
+            kb = _build_from_json(version, etag)
+        _SNAPSHOT = kb
+        # vector indexes persisted for earlier content are dead weight now
+        prune_vectors(kb.vector_index.path)
+
+    for hook in _RELOAD_HOOKS:
+        hook()
+    return kb
+
+
+def _file_stats():
+    stats = []
+    for filename in KB_FILES:
+        try:
+            st = os.stat(os.path.join(DATA_DIR, filename))
+            stats.append((st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            stats.append(None)
+    return stats
+
+
+def watch(interval: float, stop: threading.Event):
+    """Poll the data files every interval seconds and reload on change."""
+    seen = _file_stats()
+    while not stop.wait(interval):
+        current = _file_stats()
+        if current == seen:
+            continue
+        seen = current
+        try:
+            reload(force=False)
+        except Exception as exc:  # keep serving the old snapshot
+            print(f"⚠️ KB reload failed: {exc}")
+
+
+if __name__ != "__main__":  # the snapshot builder below loads its own copy
+    reload()
+
+
+# -----------------------
+# Module-level lookups (current snapshot)
+# -----------------------
+
+def find_documents(query):
+    return _SNAPSHOT.find_documents(query)
+
+
+def find_schemes(query):
+    return _SNAPSHOT.find_schemes(query)
+
+
+def get_document_info(query):
+    kb = _SNAPSHOT
+    keys = kb.find_documents(query)
+    if keys:
+        return keys[0], kb.documents[keys[0]]
     return None, None
 
 
-def get_scheme_info(message: str):
-    text = message.lower()
-    for key, value in SCHEMES.items():
-        if key in text:
-            return key, value
+def get_scheme_info(query):
+    kb = _SNAPSHOT
+    keys = kb.find_schemes(query)
+    if keys:
+        return keys[0], kb.schemes[keys[0]]
     return None, None
+
+
+def semantic_search(query, k: int = 5, kind: str | None = None):
+    return _SNAPSHOT.semantic_search(query, k, kind)
+
+
+def search(query, k: int = 5, kind: str | None = None):
+    return _SNAPSHOT.search(query, k, kind)
+
+
+def get_entry(kind: str, key: str):
+    return _SNAPSHOT.get_entry(kind, key)
+
+
+def pathway(scheme: str):
+    return _SNAPSHOT.pathway(scheme)
+
+
+def pathway_steps(kind: str, key: str, language: str = "en"):
+    return _SNAPSHOT.pathway_steps(kind, key, language)
+
+
+def eligible_schemes(limit: int | None = None, **profile):
+    return _SNAPSHOT.eligible_schemes(limit, **profile)
+
+
+def nearest_offices(pincode: str, k: int = 3, office_type: str | None = None):
+    return _SNAPSHOT.nearest_offices(pincode, k, office_type)
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else SNAPSHOT_PATH
+    started = time.perf_counter()
+    kb, size = build_snapshot(path)
+    print(
+        f"✅ KB snapshot {path}: {len(kb.documents)} documents, {len(kb.schemes)} schemes, "
+        f"{len(kb.office_index)} offices, {size / 1024:.1f} KiB "
+        f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+    )
@@ -0,0 +1,184 @@
+"""
+Async client for an OpenAI-compatible chat completions API (Groq, Ollama,
+or benchmarks/llm_stub.py locally).
+
+The LLM only rephrases the rule-based answer in simple language; it is
+never the source of facts, so whenever it is slow, failing or not
+configured the rule-based answer is served as is.
+
+  * one pooled keep-alive HTTP client per process, so a call does not pay
+    for a TCP/TLS handshake;
+  * a semaphore caps the upstream calls in flight;
+  * every call has a hard HTTP timeout, and every caller a latency budget
+    after which it stops waiting and falls back;
+  * singleflight: callers with the same prompt while a call for it is in
+    flight share that call instead of starting their own. A caller whose
+    budget runs out leaves the shared call running for the others.
+
+Set SAHAJ_LLM_URL (e.g. https://api.groq.com/openai/v1) to enable it.
+"""
+
+import asyncio
+import json
+import os
+
+import httpx
+
+from app.schemas.chat import ChatResponse
+from app.services.responses import CONSTANT_RESPONSES, render
+from app.utils import metrics
+
+LLM_URL = os.environ.get("SAHAJ_LLM_URL", "")
+LLM_MODEL = os.environ.get("SAHAJ_LLM_MODEL", "llama-3.1-8b-instant")
+LLM_API_KEY = os.environ.get("SAHAJ_LLM_API_KEY", "")
+LLM_CONCURRENCY = int(os.environ.get("SAHAJ_LLM_CONCURRENCY", "8"))
+LLM_TIMEOUT = float(os.environ.get("SAHAJ_LLM_TIMEOUT", "10"))            # seconds, per upstream call
+LLM_BUDGET_MS = float(os.environ.get("SAHAJ_LLM_BUDGET_MS", "1500"))      # per chat request
+LLM_MAX_TOKENS = int(os.environ.get("SAHAJ_LLM_MAX_TOKENS", "300"))
+
+LANGUAGE_NAMES = {"en": "English", "hi": "Hindi"}
+
+SYSTEM_PROMPT = (
+    "You are SahajAI, an assistant for Indian government services. Rewrite the "
+    "facts below as a short, simple answer to the user's question in {language}. "
+    "Use only these facts and keep every document and office name."
+)
+
+
+class LLMClient:
+    def __init__(self, base_url, model, api_key="", concurrency=8, timeout=10.0, max_tokens=300):
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.api_key = api_key
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.max_tokens = max_tokens
+        self._http = None
+        self._semaphore = None
+        self._inflight = {}          # (system, prompt) -> shared upstream call
+        self.calls = 0               # upstream requests started
+        self.coalesced = 0           # callers that joined one already in flight
+        self.timeouts = 0            # callers whose budget ran out
+        self.errors = 0              # upstream calls that failed
+
+    def _client(self):
+        # created on first use so it binds to the running event loop
+        if self._http is None:
+            headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+            self._http = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=headers,
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(
+                    max_connections=self.concurrency,
+                    max_keepalive_connections=self.concurrency,
+                    keepalive_expiry=60.0,
+                ),
+            )
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._http
+
+    async def aclose(self):
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def _call(self, system, prompt):
+        http = self._client()
+        async with self._semaphore:
+            self.calls += 1
+            response = await http.post("/chat/completions", json={
+                "model": self.model,
+                "messages": [
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": prompt},
+                ],
+                "temperature": 0.2,
+                "max_tokens": self.max_tokens,
+            })
+            response.raise_for_status()
+            return response.json()["choices"][0]["message"]["content"].strip()
+
+    async def complete(self, prompt, system="", budget_ms=None):
+        """The completion text, or None if it failed or did not arrive within budget_ms."""
+        key = (system, prompt)
+        call = self._inflight.get(key)
+        if call is None:
+            call = asyncio.ensure_future(self._call(system, prompt))
+            self._inflight[key] = call
+            call.add_done_callback(lambda done: self._finished(key, done))
+        else:
+            self.coalesced += 1
+
+        try:
+            # shield: giving up on the budget must not cancel the shared call
+            return await asyncio.wait_for(
+                asyncio.shield(call), None if budget_ms is None else budget_ms / 1000,
+            )
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+        except Exception:   # HTTP, timeout or malformed reply; counted once in _finished
+            pass
+        return None
+
+    def _finished(self, key, call):
+        if self._inflight.get(key) is call:
+            del self._inflight[key]
+        if not call.cancelled() and call.exception() is not None:
+            self.errors += 1
+
+    def stats(self):
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "inflight": len(self._inflight),
+        }
+
+
+CLIENT = LLMClient(
+    LLM_URL, LLM_MODEL, LLM_API_KEY, LLM_CONCURRENCY, LLM_TIMEOUT, LLM_MAX_TOKENS,
+) if LLM_URL else None
+
+
+def enabled() -> bool:
+    return CLIENT is not None
+
+
+@metrics.collector
+def llm_metrics():
+    if CLIENT is None:
+        return
+    for name, documentation in (
+        ("calls", "Upstream LLM calls started."),
+        ("coalesced", "LLM callers that joined an identical call in flight."),
+        ("timeouts", "LLM callers that fell back after their latency budget."),
+        ("errors", "Upstream LLM calls that failed."),
+    ):
+        yield from metrics.sample_lines(f"sahaj_llm_{name}_total", documentation, "counter", [((), getattr(CLIENT, name))])
+
+
+async def simplify(body: bytes, message: str, language: str, budget_ms: float = LLM_BUDGET_MS):
+    """
+    (body, used_llm) for a rendered ChatResponse: its answer rephrased by
+    the LLM, or the body unchanged when the LLM is off, slow or failing.
+    Only looked-up answers are rephrased; constant replies are served as is.
+    """
+    if CLIENT is None or body in CONSTANT_RESPONSES.values():
+        return body, False
+    data = json.loads(body)
+    if data["mode"] != "answer":
+        return body, False
+
+    system = SYSTEM_PROMPT.format(language=LANGUAGE_NAMES.get(language, "English"))
+    text = await CLIENT.complete(f"Question: {message}\n\nFacts:\n{data['answer']}", system, budget_ms)
+    if not text:
+        return body, False
+    data["answer"] = text
+    return render(ChatResponse(**data)), True
+
+
+async def aclose():
+    if CLIENT is not None:
+        await CLIENT.aclose()
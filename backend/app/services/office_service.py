@@ -0,0 +1,206 @@
+"""
+Office discovery: nearest CSC / Tehsil / Aadhaar Seva Kendra.
+
+Offices are bucketed per type into a uniform lat/lon grid. A query scans
+rings of cells outwards from the user's cell and stops as soon as the
+k-th best distance is closer than anything an unvisited ring could hold,
+so it touches a handful of cells regardless of how many offices exist.
+Pincodes map straight to their offices and to a centroid location. A
+pincode no office carries is placed at the centroid of its sorting
+district (its first three digits), when any office shares that.
+
+Grid cells and pincodes are hash lookups into flat id arrays, so the
+whole index round-trips through to_arrays()/from_arrays().
+"""
+
+import heapq
+import math
+import re
+from array import array
+
+from app.services.records import OfficeRecord
+from app.utils.binary_store import JsonList, Lookup
+
+CELL_DEG = 0.25
+MAX_KM = 100.0       # offices further than this are not worth suggesting
+EARTH_KM = 6371.0
+KM_PER_DEG = 111.32
+
+PINCODE_RE = re.compile(r"\b[1-9]\d{5}\b")
+
+# office type -> words that ask for it (checked in order)
+OFFICE_TYPES = {
+    "aadhaar": ("aadhaar", "aadhar", "uidai"),
+    "tehsil": ("tehsil", "tahsil", "sdm", "tahsildar"),
+    "csc": ("csc", "common", "jan", "seva"),
+}
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_KM * math.asin(math.sqrt(a))
+
+
+def _cell(lat, lon):
+    return int(math.floor(lat / CELL_DEG)), int(math.floor(lon / CELL_DEG))
+
+
+def office_type_for(tokens):
+    for office_type, words in OFFICE_TYPES.items():
+        if any(w in tokens for w in words):
+            return office_type
+    return None
+
+
+def _cell_key(office_type, i, j):
+    return f"{office_type or ''}:{i}:{j}"
+
+
+def _flatten(groups):
+    """{key: [ids]} -> (Lookup key -> group id, offsets, ids)."""
+    lookup, offsets, ids = Lookup(), array("I", [0]), array("I")
+    for key, members in groups.items():
+        lookup[key] = len(lookup)
+        ids.extend(members)
+        offsets.append(len(ids))
+    return lookup, offsets, ids
+
+
+class OfficeIndex:
+    def __init__(self, offices):
+        self.offices = offices
+        self.lat = array("d", (o["lat"] for o in offices))
+        self.lon = array("d", (o["lon"] for o in offices))
+
+        by_pincode = {}
+        cells = {}                         # "type:i:j" (type "" = any) -> [ids]
+        types = set()
+        for idx, office in enumerate(offices):
+            by_pincode.setdefault(str(office["pincode"]), []).append(idx)
+            i, j = _cell(office["lat"], office["lon"])
+            types.add(office.get("type"))
+            for office_type in {None, office.get("type")}:
+                cells.setdefault(_cell_key(office_type, i, j), []).append(idx)
+
+        self._pincodes, self._pincode_offsets, self._pincode_ids = _flatten(by_pincode)
+        self._cells, self._cell_offsets, self._cell_ids = _flatten(cells)
+        self._types = sorted(t for t in types if t)
+
+        # pincode -> centroid of its offices, the query point for that pincode
+        self._pincode_lat = array("d", (sum(self.lat[i] for i in ids) / len(ids) for ids in by_pincode.values()))
+        self._pincode_lon = array("d", (sum(self.lon[i] for i in ids) / len(ids) for ids in by_pincode.values()))
+
+        # sorting district (first 3 digits) -> centroid of its offices
+        by_district = {}
+        for pincode, ids in by_pincode.items():
+            by_district.setdefault(pincode[:3], []).extend(ids)
+        self._districts = Lookup()
+        for district in by_district:
+            self._districts[district] = len(self._districts)
+        self._district_lat = array("d", (sum(self.lat[i] for i in ids) / len(ids) for ids in by_district.values()))
+        self._district_lon = array("d", (sum(self.lon[i] for i in ids) / len(ids) for ids in by_district.values()))
+
+        grid = [_cell(o["lat"], o["lon"]) for o in offices] or [(0, 0)]
+        self._bounds = array("i", (
+            min(c[0] for c in grid), max(c[0] for c in grid),
+            min(c[1] for c in grid), max(c[1] for c in grid),
+        ))
+
+    def __len__(self):
+        return len(self.offices)
+
+    def to_arrays(self):
+        return {
+            "offices": JsonList.encode(self.offices),
+            "lat": self.lat,
+            "lon": self.lon,
+            "pincodes": self._pincodes,
+            "pincode_offsets": self._pincode_offsets,
+            "pincode_ids": self._pincode_ids,
+            "pincode_lat": self._pincode_lat,
+            "pincode_lon": self._pincode_lon,
+            "districts": self._districts,
+            "district_lat": self._district_lat,
+            "district_lon": self._district_lon,
+            "cells": self._cells,
+            "cell_offsets": self._cell_offsets,
+            "cell_ids": self._cell_ids,
+            "types": self._types,
+            "bounds": self._bounds,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        self = cls.__new__(cls)
+        self.offices = JsonList(arrays["offices"], OfficeRecord.from_dict)
+        self.lat = arrays["lat"]
+        self.lon = arrays["lon"]
+        for name in (
+            "pincodes", "pincode_offsets", "pincode_ids", "pincode_lat", "pincode_lon",
+            "districts", "district_lat", "district_lon",
+            "cells", "cell_offsets", "cell_ids", "types", "bounds",
+        ):
+            setattr(self, f"_{name}", arrays[name])
+        return self
+
+    def by_pincode(self, pincode):
+        p = self._pincodes.get(str(pincode))
+        if p is None:
+            return []
+        return [self.offices[self._pincode_ids[i]] for i in range(self._pincode_offsets[p], self._pincode_offsets[p + 1])]
+
+    def locate(self, pincode):
+        """(lat, lon) of a pincode, or None if neither it nor its district is known."""
+        pincode = str(pincode)
+        p = self._pincodes.get(pincode)
+        if p is not None:
+            return self._pincode_lat[p], self._pincode_lon[p]
+        d = self._districts.get(pincode[:3])
+        if d is None:
+            return None
+        return self._district_lat[d], self._district_lon[d]
+
+    def _cell_members(self, office_type, i, j):
+        c = self._cells.get(_cell_key(office_type, i, j))
+        if c is None:
+            return ()
+        return self._cell_ids[self._cell_offsets[c]:self._cell_offsets[c + 1]]
+
+    def nearest(self, lat, lon, k=3, office_type=None, max_km=MAX_KM):
+        """[(distance_km, office), ...] for the k closest offices within max_km, nearest first."""
+        if not len(self) or k <= 0 or (office_type is not None and office_type not in self._types):
+            return []
+
+        ci, cj = _cell(lat, lon)
+        min_i, max_i, min_j, max_j = self._bounds
+        max_ring = max(abs(ci - min_i), abs(ci - max_i), abs(cj - min_j), abs(cj - max_j))
+
+        best = []                          # max-heap of (-distance, id)
+        for ring in range(max_ring + 1):
+            # everything in this ring is at least (ring - 1) cells away; use the
+            # smallest km-per-degree (longitude, poleward edge) as the bound
+            km_per_deg = KM_PER_DEG * math.cos(math.radians(min(abs(lat) + (ring + 1) * CELL_DEG, 89.0)))
+            reach = (ring - 1) * CELL_DEG * km_per_deg
+            if reach > max_km or (len(best) == k and -best[0][0] <= reach):
+                break
+            for i in range(ci - ring, ci + ring + 1):
+                edge = i in (ci - ring, ci + ring)
+                for j in (range(cj - ring, cj + ring + 1) if edge else (cj - ring, cj + ring)):
+                    for idx in self._cell_members(office_type, i, j):
+                        d = haversine_km(lat, lon, self.lat[idx], self.lon[idx])
+                        if d > max_km:
+                            continue
+                        if len(best) < k:
+                            heapq.heappush(best, (-d, idx))
+                        elif d < -best[0][0]:
+                            heapq.heapreplace(best, (-d, idx))
+
+        return [(round(-d, 2), self.offices[idx]) for d, idx in sorted(best, reverse=True)]
+
+    def nearest_to_pincode(self, pincode, k=3, office_type=None, max_km=MAX_KM):
+        location = self.locate(pincode)
+        if location is None:
+            return []
+        return self.nearest(*location, k=k, office_type=office_type, max_km=max_km)
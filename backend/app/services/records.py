@@ -0,0 +1,85 @@
+"""
+Compact in-memory records for knowledge-base entries.
+
+JSON loads every entry as a dict of lists of fresh strings, so values that
+repeat across thousands of entries ("CSC", "Indian citizen") are stored
+thousands of times. Records keep the known fields in __slots__, intern
+every string and freeze lists into tuples. They are read-only Mappings, so
+callers keep using entry["documents"] and entry.get("office") unchanged.
+Fields not declared on the class are kept in a small side dict.
+"""
+
+import sys
+from collections.abc import Mapping
+
+
+def compact(value):
+    """Interned strings, tuples for lists, recursively."""
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, list):
+        return tuple(compact(v) for v in value)
+    if isinstance(value, dict):
+        return {sys.intern(k): compact(v) for k, v in value.items()}
+    return value
+
+
+class Record(Mapping):
+    __slots__ = ("_extra",)
+    FIELDS = ()
+
+    @classmethod
+    def from_dict(cls, data):
+        self = cls.__new__(cls)
+        self._extra = None
+        for name, value in data.items():
+            if name in cls.FIELDS:
+                setattr(self, name, compact(value))
+            else:
+                if self._extra is None:
+                    self._extra = {}
+                self._extra[sys.intern(name)] = compact(value)
+        return self
+
+    def __getitem__(self, name):
+        if name in self.FIELDS:
+            try:
+                return getattr(self, name)
+            except AttributeError:
+                raise KeyError(name) from None
+        if self._extra is not None and name in self._extra:
+            return self._extra[name]
+        raise KeyError(name)
+
+    def __iter__(self):
+        for name in self.FIELDS:
+            if hasattr(self, name):
+                yield name
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
+class DocumentRecord(Record):
+    FIELDS = ("documents", "office", "prerequisites", "aliases", "translations")
+    __slots__ = FIELDS
+
+
+class SchemeRecord(Record):
+    FIELDS = ("description", "eligibility", "office", "documents", "aliases", "translations")
+    __slots__ = FIELDS
+
+
+class OfficeRecord(Record):
+    FIELDS = ("id", "type", "name", "address", "pincode", "district", "state", "lat", "lon")
+    __slots__ = FIELDS
+
+
+def compact_entries(entries, record):
+    """{key: dict} -> {interned key: record}."""
+    return {sys.intern(key): record.from_dict(value) for key, value in entries.items()}
@@ -0,0 +1,97 @@
+"""
+Constant chat replies, rendered to JSON bytes once at import.
+
+Returning these as raw responses skips building a ChatResponse and
+FastAPI's response_model validation + serialisation on every request.
+Any other fixed reply can be added with register_response().
+"""
+
+from fastapi.responses import Response
+
+from app.schemas.chat import ChatResponse
+from app.utils.text import normalize
+
+JSON = "application/json"
+
+CONSTANT_RESPONSES = {}   # (name, language) -> JSON bytes
+
+
+def render(response: ChatResponse) -> bytes:
+    return response.model_dump_json().encode("utf-8")
+
+
+def register_response(name: str, response: ChatResponse):
+    CONSTANT_RESPONSES[(name, response.language)] = render(response)
+
+
+def constant_body(name: str, language: str) -> bytes:
+    # languages without their own rendering get the English reply
+    body = CONSTANT_RESPONSES.get((name, language))
+    return body if body is not None else CONSTANT_RESPONSES[(name, "en")]
+
+
+def json_response(body: bytes) -> Response:
+    return Response(content=body, media_type=JSON)
+
+
+# -------------------------
+# GREETING (NO LLM)
+# -------------------------
+GREETINGS = frozenset(normalize(g) for g in ["hi", "hello", "hey", "namaste", "नमस्ते"])
+
+register_response("greeting", ChatResponse(
+    mode="answer",
+    intent="unknown",
+    language="hi",
+    answer=(
+        "नमस्ते! 👋 मैं SahajAI हूँ।\n\n"
+        "मैं आपकी मदद कर सकता हूँ:\n"
+        "• सरकारी योजनाओं की जानकारी\n"
+        "• आवश्यक दस्तावेज़\n"
+        "• कार्यालय मार्गदर्शन (तहसील, CSC, जन सेवा केंद्र)\n"
+        "• फ़ॉर्म भरने के चरण\n\n"
+        "आप क्या जानना चाहते हैं?"
+    ),
+    confidence=0.9
+))
+
+register_response("greeting", ChatResponse(
+    mode="answer",
+    intent="unknown",
+    language="en",
+    answer=(
+        "Hello! 👋 I’m SahajAI.\n\n"
+        "I can help you with:\n"
+        "• Government schemes\n"
+        "• Required documents\n"
+        "• Office guidance (Tehsil, CSC, Jan Seva Kendra)\n"
+        "• Step-by-step form filling\n\n"
+        "How can I assist you today?"
+    ),
+    confidence=0.9
+))
+
+# -------------------------
+# FINAL FALLBACK (BILINGUAL)
+# -------------------------
+register_response("fallback", ChatResponse(
+    mode="fallback",
+    intent="unknown",
+    language="hi",
+    answer=(
+        "माफ़ कीजिए, मुझे इस प्रश्न की सटीक जानकारी नहीं मिली।\n"
+        "कृपया सरकारी योजनाओं, दस्तावेज़ों या कार्यालयों से संबंधित प्रश्न पूछें।"
+    ),
+    confidence=0.3
+))
+
+register_response("fallback", ChatResponse(
+    mode="fallback",
+    intent="unknown",
+    language="en",
+    answer=(
+        "Sorry, I couldn’t find exact information for this query.\n"
+        "Please ask about government schemes, documents, or offices."
+    ),
+    confidence=0.3
+))
@@ -0,0 +1,254 @@
+"""
+BM25 retrieval over the scheme and document knowledge base.
+
+The inverted index is built once at load time. Postings for every term are
+stored back to back in flat arrays (entry ids + term frequencies), and
+each term maps to its slice. Everything is flat arrays plus string lists,
+so the index also round-trips through to_arrays()/from_arrays().
+"""
+
+import heapq
+import math
+import os
+from array import array
+from collections import Counter
+from typing import NamedTuple
+
+from app.utils.aho_corasick import AhoCorasick
+from app.utils.binary_store import Lookup
+from app.utils.symspell import SymSpell
+from app.utils.text import as_query, normalize, tokenize, words
+
+K1 = 1.2
+B = 0.75
+KEY_BOOST = 2          # key tokens count this many times towards tf
+KEY_MATCH_BONUS = 1.0  # added when an entry's whole key occurs in the query
+CONFIDENCE_PIVOT = 1.0
+MIN_SCORE = 0.5        # hits below this are treated as no match
+# A hit whose key or alias is not named in the query only overlaps it on
+# field words ("birth" in Aadhaar's "Date of Birth Proof"); it needs several
+# strong terms before it is taken as the answer.
+MIN_FIELD_SCORE = 2.0
+
+# Typo tolerance for keys and aliases named in a query ("adhar", "awas yojna").
+# SAHAJ_FUZZY_DISTANCE caps the edit distance per word (0 disables it); short
+# words get less slack so "card" never turns into "ward".
+FUZZY_MAX_DISTANCE = int(os.environ.get("SAHAJ_FUZZY_DISTANCE", "2"))
+FUZZY_MIN_LENGTH = {1: 4, 2: 8}    # edit distance -> shortest word allowed it
+FUZZY_PENALTY = 0.25               # key bonus lost per corrected character
+
+
+class SearchHit(NamedTuple):
+    kind: str          # "document" | "scheme"
+    key: str
+    score: float
+
+
+def score_to_confidence(score: float) -> float:
+    return round(min(0.95, score / (score + CONFIDENCE_PIVOT)), 2)
+
+
+def fuzzy_limit(word, max_distance=FUZZY_MAX_DISTANCE):
+    limit = 0
+    for distance, length in FUZZY_MIN_LENGTH.items():
+        if len(word) >= length:
+            limit = distance
+    return min(limit, max_distance)
+
+
+def _document_fields(key, value):
+    yield key, KEY_BOOST
+    yield " ".join(value.get("documents", [])), 1
+    yield value.get("office", ""), 1
+
+
+def _scheme_fields(key, value):
+    yield key, KEY_BOOST
+    yield value.get("description", ""), 1
+    yield " ".join(value.get("eligibility", [])), 1
+    yield value.get("office", ""), 1
+
+
+class SearchIndex:
+    def __init__(self, documents, schemes):
+        entries = []                 # entry id -> (kind, key)
+        postings = {}                # term -> list[(entry id, tf)]
+        lengths = []
+
+        for kind, items, fields in (
+            ("document", documents, _document_fields),
+            ("scheme", schemes, _scheme_fields),
+        ):
+            for key, value in items.items():
+                entry_id = len(entries)
+                entries.append((kind, key))
+
+                tf = Counter()
+                for text, weight in fields(key, value):
+                    for token in tokenize(text):
+                        tf[token] += weight
+                lengths.append(sum(tf.values()))
+
+                for term, count in tf.items():
+                    postings.setdefault(term, []).append((entry_id, count))
+
+        n = len(entries)
+        avg_len = (sum(lengths) / n) if n else 0.0
+
+        self._keys = [key for _, key in entries]
+        self._kinds = array("B", (kind == "scheme" for kind, _ in entries))
+        # per-entry BM25 length normalisation, precomputed
+        self._norm = array("d", (
+            K1 * (1 - B + B * (length / avg_len)) if avg_len else K1
+            for length in lengths
+        ))
+
+        # a key (or alias) named in the query outranks incidental term overlap,
+        # which matters when a key ("aadhaar") is common in other entries' fields
+        key_entries = {}
+        bare_words = set()           # one-word names that are also a word of a longer one
+        entry_id = 0
+        for items in (documents, schemes):
+            for key, value in items.items():
+                names = [normalize(name) for name in (key, *value.get("aliases", ()))]
+                for name in names:
+                    ids = key_entries.setdefault(name, [])
+                    if entry_id not in ids:
+                        ids.append(entry_id)
+                    if " " in name:
+                        bare_words.update(w for w in name.split() if w in names)
+                entry_id += 1
+        self._key_matcher = AhoCorasick(key_entries)
+        self._key_offsets = array("I", [0])   # key pattern id -> slice of _key_entries
+        self._key_entries = array("I")
+        # a bare word of a longer name ("ration" of "ration card") is an
+        # ordinary word, and a typo of another ordinary word ("nation") is
+        # likelier than a typo of it, so it is only ever matched as typed
+        self._key_exact = array("B", (key in bare_words for key in self._key_matcher.patterns))
+        for key in self._key_matcher.patterns:
+            self._key_entries.extend(key_entries[key])
+            self._key_offsets.append(len(self._key_entries))
+        # numbers in keys ("yojana 2") are never corrected, only letters
+        self._spell = SymSpell(
+            {w for key in key_entries for w in words(key) if not w.isdigit()}, FUZZY_MAX_DISTANCE,
+        )
+
+        self._terms = Lookup()       # term -> term id
+        self._offsets = array("I", [0])   # term id -> slice of _ids / _tfs
+        self._idf = array("d")
+        self._ids = array("I")
+        self._tfs = array("H")
+        for term, plist in postings.items():
+            df = len(plist)
+            self._terms[term] = len(self._idf)
+            self._idf.append(math.log(1 + (n - df + 0.5) / (df + 0.5)))
+            for entry_id, count in plist:
+                self._ids.append(entry_id)
+                self._tfs.append(min(count, 0xFFFF))
+            self._offsets.append(len(self._ids))
+
+    def __len__(self):
+        return len(self._keys)
+
+    def to_arrays(self):
+        return {
+            "keys": self._keys,
+            "kinds": self._kinds,
+            "norm": self._norm,
+            "key_matcher": self._key_matcher.to_arrays(),
+            "key_offsets": self._key_offsets,
+            "key_entries": self._key_entries,
+            "key_exact": self._key_exact,
+            "spell": self._spell.to_arrays(),
+            "terms": self._terms,
+            "offsets": self._offsets,
+            "idf": self._idf,
+            "ids": self._ids,
+            "tfs": self._tfs,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        self = cls.__new__(cls)
+        for name in ("keys", "kinds", "norm", "key_offsets", "key_entries", "key_exact", "terms", "offsets", "idf", "ids", "tfs"):
+            setattr(self, f"_{name}", arrays[name])
+        self._key_matcher = AhoCorasick.from_arrays(arrays["key_matcher"])
+        self._spell = SymSpell.from_arrays(arrays["spell"])
+        return self
+
+    def entry(self, entry_id):
+        return ("scheme" if self._kinds[entry_id] else "document"), self._keys[entry_id]
+
+    def match_keys(self, query, kind=None, max_distance=FUZZY_MAX_DISTANCE):
+        """
+        [(entry id, distance), ...] for entries whose key or an alias is named
+        in the query as whole words, closest and longest first. Exact mentions
+        win; only when there are none are misspelt words corrected against
+        the key vocabulary and matched again, with distance = characters
+        corrected in the match.
+        """
+        query = as_query(query)
+        found = query.memo((self, max_distance), lambda: self._find_key_ids(query, max_distance))
+
+        want = None if kind is None else int(kind == "scheme")
+        patterns, kinds = self._key_matcher.patterns, self._kinds
+        key_offsets, key_entries = self._key_offsets, self._key_entries
+        best = {}
+        for key_id in sorted(found, key=lambda p: (found[p], -len(patterns[p]))):
+            for i in range(key_offsets[key_id], key_offsets[key_id + 1]):
+                entry_id = key_entries[i]
+                if (want is None or kinds[entry_id] == want) and entry_id not in best:
+                    best[entry_id] = found[key_id]
+        return list(best.items())
+
+    def _find_key_ids(self, query, max_distance):
+        """{key pattern id: distance} of the keys and aliases the query names."""
+        matcher = self._key_matcher
+        found = {key_id: 0 for key_id in matcher.find_ids(query.text, True)}
+
+        if not found and max_distance > 0:
+            corrected, costs = [], []
+            for word in query.words:
+                hit = self._spell.lookup(word, fuzzy_limit(word, max_distance))
+                corrected.append(hit[0] if hit else word)
+                costs.append(hit[1] if hit else 0)
+
+            if any(costs):
+                text = " ".join(corrected)
+                ends, pos = [], -1         # end offset of each corrected word
+                for word in corrected:
+                    pos += len(word) + 1
+                    ends.append(pos)
+                for end, key_id in matcher.iter_word_ids(text):
+                    start = end - len(matcher.patterns[key_id])
+                    distance = sum(c for c, e in zip(costs, ends) if start < e <= end + 1)
+                    if distance and self._key_exact[key_id]:
+                        continue
+                    if distance <= max_distance and distance < found.get(key_id, max_distance + 1):
+                        found[key_id] = distance
+        return found
+
+    def search(self, query, k=5, kind=None):
+        want = None if kind is None else int(kind == "scheme")
+        ids, tfs, norm, kinds = self._ids, self._tfs, self._norm, self._kinds
+        offsets = self._offsets
+        scores = {}
+
+        query = as_query(query)
+        for entry_id, distance in self.match_keys(query, kind):
+            scores[entry_id] = KEY_MATCH_BONUS - FUZZY_PENALTY * distance
+
+        for term in set(query.tokens):
+            term_id = self._terms.get(term)
+            if term_id is None:
+                continue
+            idf = self._idf[term_id]
+            for i in range(offsets[term_id], offsets[term_id + 1]):
+                entry_id = ids[i]
+                if want is not None and kinds[entry_id] != want:
+                    continue
+                tf = tfs[i]
+                scores[entry_id] = scores.get(entry_id, 0.0) + idf * tf * (K1 + 1) / (tf + norm[entry_id])
+
+        top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [SearchHit(*self.entry(entry_id), round(score, 4)) for entry_id, score in top]
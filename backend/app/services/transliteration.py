@@ -0,0 +1,81 @@
+"""
+Transliteration alias table: Hindi / Hinglish phrasing -> English KB terms.
+
+Built at load time from app/data/lexicon.json (common words: दस्तावेज़ ->
+documents) and from every KB key and alias. Each phrase is stored under the
+phonetic keys of its words (app.utils.indic), so "आधार", "aadhar" and
+"adhar" all land on the KB key "aadhaar". rewrite() replaces the longest
+known phrase at each position with its English term, so Hindi and Hinglish
+messages hit the same intent keywords and indexes as English ones.
+"""
+
+from app.utils.binary_store import Lookup
+from app.utils.indic import word_key
+from app.utils.text import TOKEN_RE, normalize
+
+MAX_PHRASE_WORDS = 4
+
+
+def phrase_key(phrase):
+    return " ".join(word_key(w) for w in TOKEN_RE.findall(normalize(phrase)))
+
+
+class AliasTable:
+    def __init__(self, lexicon, documents, schemes):
+        self.terms = []              # term id -> English phrase
+        self._aliases = Lookup()     # phrase key -> term id
+        self._starts = Lookup()      # first word key -> longest phrase starting with it
+
+        # curated words first, then KB names; the first phrase to claim a key keeps it
+        pairs = [(variant, term) for term, variants in lexicon.items() for variant in variants]
+        for items in (documents, schemes):
+            for key, value in items.items():
+                pairs += [(name, key) for name in (key, *value.get("aliases", ()))]
+
+        ids = {}
+        for variant, term in pairs:
+            key = phrase_key(variant)
+            if not key or key in self._aliases:
+                continue
+            if term not in ids:
+                ids[term] = len(self.terms)
+                self.terms.append(term)
+            self._aliases[key] = ids[term]
+            first, n = key.split(" ", 1)[0], min(MAX_PHRASE_WORDS, key.count(" ") + 1)
+            self._starts[first] = max(self._starts.get(first, 0), n)
+
+    def __len__(self):
+        return len(self._aliases)
+
+    def to_arrays(self):
+        return {"terms": self.terms, "aliases": self._aliases, "starts": self._starts}
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        self = cls.__new__(cls)
+        self.terms = arrays["terms"]
+        self._aliases = arrays["aliases"]
+        self._starts = arrays["starts"]
+        return self
+
+    def rewrite(self, text):
+        """text with every known Hindi / Hinglish phrase replaced by its English term."""
+        words = TOKEN_RE.findall(text)
+        keys = [word_key(w) for w in words]
+        out, changed, i = [], False, 0
+
+        while i < len(words):
+            longest = self._starts.get(keys[i], 0)
+            for n in range(min(longest, len(words) - i), 0, -1):
+                term_id = self._aliases.get(" ".join(keys[i:i + n]))
+                if term_id is not None:
+                    term = self.terms[term_id]
+                    changed = changed or term != " ".join(words[i:i + n])
+                    out.append(term)
+                    i += n
+                    break
+            else:
+                out.append(words[i])
+                i += 1
+
+        return " ".join(out) if changed else text
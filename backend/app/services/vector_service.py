@@ -0,0 +1,216 @@
+"""
+Offline semantic matching over the knowledge base.
+
+Texts are represented as TF-IDF weighted character n-gram vectors (no
+model download, no network), L2-normalised, and a query is scored by
+cosine similarity. The vectors are sparse, so they are kept as an inverted
+index: for every n-gram feature, the entries containing it and their
+weights, back to back in flat arrays. A query only reads the postings of
+its own n-grams, rarest first, and stops before the n-grams whose postings
+would take it past POSTINGS_BUDGET; those are the commonest and weigh the
+least. N-grams in more than half the entries get no postings at all.
+
+The index is persisted with app.utils.binary_store under a fingerprint of
+the content (or stored inside the KB snapshot) and memory-mapped on load,
+so every worker shares the same pages. If the index directory cannot be
+written the index simply stays in memory.
+
+embed_hashes() also provides small dense hashed embeddings, which the
+semantic answer cache compares in bulk.
+"""
+
+import glob
+import hashlib
+import os
+
+import numpy as np
+
+from app.services.search_service import SearchHit
+from app.utils.binary_store import Store, write_store
+from app.utils.text import as_query, char_ngram_hashes
+
+INDEX_DIR = os.environ.get(
+    "SAHAJ_INDEX_DIR",
+    os.path.join(os.path.dirname(__file__), "..", "data", "index"),
+)
+INDEX_FORMAT = 2
+# n-grams found in more than this share of the entries get no postings
+MAX_DF_RATIO = 0.5
+# postings read per query at most, which bounds its cost on any KB size
+POSTINGS_BUDGET = int(os.environ.get("SAHAJ_VECTOR_POSTINGS_BUDGET", "20000"))
+
+
+def embed_hashes(hash_lists, dim=64):
+    """Embed pre-hashed n-gram lists into an (m, dim) L2-normalised matrix."""
+    matrix = np.zeros((len(hash_lists), dim), dtype=np.float32)
+    for row, hashes in enumerate(hash_lists):
+        if not hashes:
+            continue
+        h = np.asarray(hashes, dtype=np.uint32)
+        # top bit picks the sign so collisions cancel instead of pile up
+        signs = np.where(h >> 31, -1.0, 1.0)
+        matrix[row] = np.bincount(h % dim, weights=signs, minlength=dim)
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def entry_text(key, value):
+    parts = [key, value.get("description", ""), value.get("office", "")]
+    parts += value.get("documents", [])
+    parts += value.get("eligibility", [])
+    return " ".join(p for p in parts if p)
+
+
+def prune(keep=None, index_dir=INDEX_DIR):
+    """Delete persisted indexes other than keep (a path, or None for all)."""
+    for path in glob.glob(os.path.join(index_dir, "vectors-*")):
+        if keep is None or os.path.abspath(path) != os.path.abspath(keep):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def _postings(hash_lists):
+    """(features, idf, offsets, rows, weights) arrays of the inverted index."""
+    n = len(hash_lists)
+    lengths = np.fromiter((len(h) for h in hash_lists), dtype=np.int64, count=n)
+    hashes = np.fromiter((h for hs in hash_lists for h in hs), dtype=np.uint64, count=int(lengths.sum()))
+    rows = np.repeat(np.arange(n, dtype=np.uint64), lengths)
+
+    # (feature, row) pairs sorted by feature then row, with their counts
+    pairs, tf = np.unique((hashes << np.uint64(32)) | rows, return_counts=True)
+    pair_features = (pairs >> np.uint64(32)).astype(np.uint32)
+    pair_rows = (pairs & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+    features, df = np.unique(pair_features, return_counts=True)
+
+    idf = (np.log((1 + n) / (1 + df)) + 1).astype(np.float32)
+    feature_of_pair = np.repeat(np.arange(len(features)), df)
+    weights = tf * idf[feature_of_pair]
+    norms = np.sqrt(np.bincount(pair_rows, weights * weights, minlength=n))
+    weights /= np.where(norms > 0, norms, 1)[pair_rows]
+
+    # common n-grams keep their idf (it counts in a query's norm) but no postings
+    listed = df <= max(1, MAX_DF_RATIO * n)
+    keep = listed[feature_of_pair]
+    offsets = np.zeros(len(features) + 1, dtype=np.int64)
+    np.cumsum(np.where(listed, df, 0), out=offsets[1:])
+    return features, idf, offsets, pair_rows[keep], weights[keep].astype(np.float32)
+
+
+class VectorIndex:
+    def __init__(self, keys, schemes, features, idf, offsets, rows, weights, path=None):
+        self.keys = keys             # row -> entry key
+        self._schemes = schemes      # row -> is a scheme (bool array)
+        self._features = features    # sorted n-gram hashes (uint32)
+        self._idf = idf              # feature -> idf
+        self._offsets = offsets      # feature -> slice of _rows / _weights
+        self._rows = rows
+        self._weights = weights      # tf-idf weight, rows L2-normalised
+        self.path = path             # persisted file, if any
+
+    def __len__(self):
+        return len(self.keys)
+
+    @classmethod
+    def build(cls, documents, schemes, index_dir=INDEX_DIR):
+        entries, texts = [], []
+        for kind, items in (("document", documents), ("scheme", schemes)):
+            for key, value in items.items():
+                entries.append((kind, key))
+                texts.append(entry_text(key, value))
+
+        # file name is a fingerprint of the content, so a stale index is never reused
+        fingerprint = repr((INDEX_FORMAT, MAX_DF_RATIO, entries, texts))
+        digest = hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()[:16]
+        path = os.path.join(index_dir, f"vectors-{digest}.idx")
+
+        try:
+            return cls.from_arrays(Store(path).tree, path)
+        except (OSError, ValueError):
+            pass                     # not built yet (or unreadable)
+
+        index = cls(
+            [key for _, key in entries],
+            np.fromiter((kind == "scheme" for kind, _ in entries), dtype=bool, count=len(entries)),
+            *_postings([char_ngram_hashes(t) for t in texts]),
+        )
+        try:
+            os.makedirs(index_dir, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            write_store(tmp, index.to_arrays())
+            os.replace(tmp, path)
+            return cls.from_arrays(Store(path).tree, path)
+        except OSError as exc:
+            print(f"⚠️ Vector index not persisted ({exc}), keeping it in memory")
+            return index
+
+    def to_arrays(self):
+        return {
+            "keys": list(self.keys),
+            "schemes": self._schemes,
+            "features": self._features,
+            "idf": self._idf,
+            "offsets": self._offsets,
+            "rows": self._rows,
+            "weights": self._weights,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays, path=None):
+        return cls(*(arrays[name] for name in (
+            "keys", "schemes", "features", "idf", "offsets", "rows", "weights",
+        )), path=path)
+
+    def _scores(self, query):
+        """(candidate rows, their cosine scores) for one query."""
+        hashes = np.asarray(as_query(query).ngram_hashes, dtype=np.uint32)
+        if not len(hashes) or not len(self._features):
+            return None, None
+        features, tf = np.unique(hashes, return_counts=True)
+
+        at = np.minimum(np.searchsorted(self._features, features), len(self._features) - 1)
+        known = self._features[at] == features
+        # n-grams the index never saw weigh as much as one in a single entry
+        unseen_idf = np.log((1 + len(self.keys)) / 2) + 1
+        weights = tf * np.where(known, self._idf[at], unseen_idf)
+        weights = weights[known] / np.linalg.norm(weights)
+        at = at[known]
+
+        starts, lengths = self._offsets[at], self._offsets[at + 1] - self._offsets[at]
+        rarest = np.argsort(lengths, kind="stable")
+        within = np.cumsum(lengths[rarest]) <= POSTINGS_BUDGET
+        rarest = rarest[within]
+        starts, lengths, weights = starts[rarest], lengths[rarest], weights[rarest]
+        total = int(lengths.sum())
+        if not total:
+            return None, None
+        # positions of every posting of the query's n-grams, in one array
+        positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+        scores = np.bincount(
+            self._rows[positions], self._weights[positions] * np.repeat(weights, lengths), minlength=len(self.keys),
+        )
+        candidates = np.flatnonzero(scores > 0)     # much faster on a bool mask
+        return candidates, scores[candidates]
+
+    def search(self, query, k=5, kind=None):
+        """Top-k SearchHits, score = cosine similarity."""
+        candidates, scores = self._scores(query)
+        if candidates is None:
+            return []
+        if kind is not None:
+            wanted = self._schemes[candidates] == (kind == "scheme")
+            candidates, scores = candidates[wanted], scores[wanted]
+        if len(candidates) > k:
+            top = np.argpartition(scores, -k)[-k:]
+            candidates, scores = candidates[top], scores[top]
+        order = np.argsort(-scores, kind="stable")
+        return [
+            SearchHit("scheme" if self._schemes[i] else "document", self.keys[i], round(float(s), 4))
+            for i, s in zip(candidates[order], scores[order])
+        ]
+
+    def search_many(self, queries, k=5, kind=None):
+        return [self.search(q, k, kind) for q in queries]
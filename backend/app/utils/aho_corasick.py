@@ -0,0 +1,172 @@
+"""
+Aho-Corasick multi-pattern matcher.
+
+The automaton is built once from a set of keywords and then finds every
+keyword occurring in a text in a single left-to-right pass, so lookup cost
+depends on the length of the text and not on the number of keywords.
+
+Transitions are stored flat: node n's children are chars[offsets[n]:
+offsets[n + 1]] (sorted code points) with the matching targets. The same
+arrays round-trip through to_arrays()/from_arrays(), so a compiled
+automaton can be memory-mapped instead of rebuilt. Nodes are expanded into
+small dicts the first time a search visits them, so hot paths run at dict
+speed and untouched nodes cost nothing.
+
+Matches are plain substrings; pass whole_words=True to keep only those
+that start and end on word boundaries, so "ration" is not found inside
+"registration".
+"""
+
+import re
+from array import array
+from collections import deque
+
+WORD_CHAR_RE = re.compile(r"[\w\u0900-\u097F]")
+
+
+class AhoCorasick:
+    def __init__(self, patterns=()):
+        self.patterns = []
+        goto = [{}]
+        out = [-1]            # pattern id ending at this node, or -1
+
+        for pattern in patterns:
+            if not pattern:
+                continue
+            node = 0
+            for ch in pattern:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto.append({})
+                    out.append(-1)
+                    goto[node][ch] = nxt
+                node = nxt
+            if out[node] == -1:
+                out[node] = len(self.patterns)
+                self.patterns.append(pattern)
+
+        fail, link = self._build_links(goto, out)
+
+        self._offsets = array("I", [0])
+        self._chars = array("I")
+        self._targets = array("I")
+        for children in goto:
+            for ch in sorted(children):
+                self._chars.append(ord(ch))
+                self._targets.append(children[ch])
+            self._offsets.append(len(self._chars))
+        self._fail = array("I", fail)
+        self._out = array("i", out)
+        self._link = array("i", link)  # nearest node on the fail chain with an output
+        self._goto = {}
+
+    def __len__(self):
+        return len(self.patterns)
+
+    # -----------------------
+    # Build
+    # -----------------------
+
+    @staticmethod
+    def _build_links(goto, out):
+        fail = [0] * len(goto)
+        link = [-1] * len(goto)
+        queue = deque(goto[0].values())
+
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                state = fail[node]
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                target = goto[state].get(ch, 0)
+                fail[child] = target if target != child else 0
+                link[child] = fail[child] if out[fail[child]] != -1 else link[fail[child]]
+                queue.append(child)
+        return fail, link
+
+    def to_arrays(self):
+        return {
+            "patterns": self.patterns,
+            "offsets": self._offsets,
+            "chars": self._chars,
+            "targets": self._targets,
+            "fail": self._fail,
+            "out": self._out,
+            "link": self._link,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        self = cls.__new__(cls)
+        self.patterns = arrays["patterns"]
+        self._offsets = arrays["offsets"]
+        self._chars = arrays["chars"]
+        self._targets = arrays["targets"]
+        self._fail = arrays["fail"]
+        self._out = arrays["out"]
+        self._link = arrays["link"]
+        self._goto = {}
+        return self
+
+    # -----------------------
+    # Search
+    # -----------------------
+
+    def _expand(self, node):
+        """(char -> child, first output node on node's fail chain), cached per node."""
+        lo, hi = self._offsets[node], self._offsets[node + 1]
+        children = {chr(self._chars[j]): self._targets[j] for j in range(lo, hi)}
+        hit = node if self._out[node] != -1 else self._link[node]
+        self._goto[node] = entry = (children, hit)
+        return entry
+
+    def iter_ids(self, text):
+        """Yield (end_index, pattern id) for every occurrence in text."""
+        goto, fail, out, link = self._goto, self._fail, self._out, self._link
+        node = 0
+        children, hit = goto.get(0) or self._expand(0)
+
+        for i, ch in enumerate(text):
+            nxt = children.get(ch)
+            while nxt is None and node:
+                node = fail[node]
+                children, _ = goto.get(node) or self._expand(node)
+                nxt = children.get(ch)
+            if nxt is None:
+                continue                 # still at the root
+
+            node = nxt
+            children, hit = goto.get(node) or self._expand(node)
+            while hit > 0:
+                yield i, out[hit]
+                hit = link[hit]
+
+    def iter_word_ids(self, text):
+        """iter_ids, restricted to occurrences bounded by non-word characters."""
+        patterns, last = self.patterns, len(text) - 1
+        is_word = WORD_CHAR_RE.match
+        for end, pattern_id in self.iter_ids(text):
+            start = end - len(patterns[pattern_id]) + 1
+            if (start == 0 or not is_word(text[start - 1])) and (end == last or not is_word(text[end + 1])):
+                yield end, pattern_id
+
+    def iter_matches(self, text):
+        """Yield (end_index, pattern) for every occurrence in text."""
+        patterns = self.patterns
+        for end, pattern_id in self.iter_ids(text):
+            yield end, patterns[pattern_id]
+
+    def find_ids(self, text, whole_words=False):
+        """Return the distinct pattern ids found in text, longest pattern first."""
+        found = {}
+        for end, pattern_id in (self.iter_word_ids if whole_words else self.iter_ids)(text):
+            found.setdefault(pattern_id, end)
+        patterns = self.patterns
+        return sorted(found, key=lambda p: (-len(patterns[p]), found[p]))
+
+    def find_all(self, text, whole_words=False):
+        """Return the distinct patterns found in text, longest first."""
+        patterns = self.patterns
+        return [patterns[p] for p in self.find_ids(text, whole_words)]
@@ -0,0 +1,273 @@
+"""
+Flat, memory-mappable container for read-only index data.
+
+A store is a tree of named values written once to a single file:
+
+    MAGIC | u32 header length | JSON header | 8-byte aligned data sections
+
+Arrays (array.array / numpy) are stored raw and come back as zero-copy
+views over the mmap. Lists of strings are stored as one UTF-8 blob plus an
+offsets array (StringList; JsonList decodes records on top of one), and
+Lookup (str -> int) maps additionally get an open-addressing hash table
+(StringIndex). Opening a store only parses
+the small header, so it costs the same for any amount of data, and every
+process mapping the file shares its pages.
+"""
+
+import json
+import mmap
+import struct
+import zlib
+from array import array
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+
+MAGIC = b"SAHAJKB1"
+ALIGN = 8
+
+
+class Lookup(dict):
+    """Marks a str -> int dict that should be stored as a hash index."""
+
+
+def _hash(key: str) -> int:
+    return zlib.crc32(key.encode("utf-8"))
+
+
+# -----------------------
+# Views
+# -----------------------
+
+class StringList(Sequence):
+    """Sequence of str decoded on access from a UTF-8 blob + offsets."""
+
+    def __init__(self, blob, offsets):
+        self._blob = blob
+        self._offsets = offsets
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        return str(self._blob[self._offsets[i]:self._offsets[i + 1]], "utf-8")
+
+
+def _json_default(value):
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class JsonList(Sequence):
+    """Sequence of JSON records decoded on access (records stored as JSON strings)."""
+
+    def __init__(self, strings, factory=None):
+        self._strings = strings
+        self._factory = factory    # e.g. a record class's from_dict
+
+    @staticmethod
+    def encode(records):
+        return [
+            json.dumps(r, ensure_ascii=False, separators=(",", ":"), default=_json_default)
+            for r in records
+        ]
+
+    def __len__(self):
+        return len(self._strings)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        record = json.loads(self._strings[i])
+        return self._factory(record) if self._factory else record
+
+
+class JsonMap(Mapping):
+    """key -> JSON record mapping over a StringIndex and a JsonList."""
+
+    def __init__(self, keys, records):
+        self._keys = keys
+        self._records = records
+
+    @staticmethod
+    def encode(mapping):
+        return {
+            "keys": Lookup((key, i) for i, key in enumerate(mapping)),
+            "records": JsonList.encode(mapping.values()),
+        }
+
+    @classmethod
+    def decode(cls, arrays, factory=None):
+        return cls(arrays["keys"], JsonList(arrays["records"], factory))
+
+    def __getitem__(self, key):
+        return self._records[self._keys[key]]
+
+    def get(self, key, default=None):
+        i = self._keys.get(key)
+        return default if i is None else self._records[i]
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+
+class StringIndex(Mapping):
+    """Read-only str -> int mapping over a stored hash table."""
+
+    def __init__(self, keys, values, slots):
+        self._keys = keys
+        self._values = values
+        self._slots = slots
+        self._mask = len(slots) - 1
+
+    @staticmethod
+    def build_slots(keys):
+        size = 8
+        while size < 2 * len(keys):
+            size *= 2
+        slots = array("I", bytes(4 * size))
+        mask = size - 1
+        for i, key in enumerate(keys):
+            h = _hash(key) & mask
+            while slots[h]:
+                h = (h + 1) & mask
+            slots[h] = i + 1
+        return slots
+
+    def get(self, key, default=None):
+        slots, keys, mask = self._slots, self._keys, self._mask
+        h = _hash(key) & mask
+        while True:
+            slot = slots[h]
+            if not slot:
+                return default
+            if keys[slot - 1] == key:
+                return self._values[slot - 1]
+            h = (h + 1) & mask
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+
+# -----------------------
+# Write
+# -----------------------
+
+def write_store(path, tree, meta=None):
+    chunks = []
+    size = 0
+
+    def add(raw):
+        nonlocal size
+        pad = -size % ALIGN
+        if pad:
+            chunks.append(b"\0" * pad)
+            size += pad
+        chunks.append(raw)
+        offset = size
+        size += len(raw)
+        return [offset, len(raw)]
+
+    def encode(value):
+        if isinstance(value, Lookup):
+            keys = list(value)
+            return {
+                "t": "lookup",
+                "keys": encode(keys),
+                "values": encode(array("q", (value[k] for k in keys))),
+                "slots": encode(StringIndex.build_slots(keys)),
+            }
+        if isinstance(value, dict):
+            return {"t": "tree", "items": {k: encode(v) for k, v in value.items()}}
+        if isinstance(value, array):
+            return {"t": "array", "code": value.typecode, "at": add(value.tobytes())}
+        if isinstance(value, np.ndarray):
+            value = np.ascontiguousarray(value)
+            return {"t": "ndarray", "dtype": value.dtype.str, "shape": list(value.shape), "at": add(value.tobytes())}
+        if isinstance(value, (list, tuple)):
+            blobs = [s.encode("utf-8") for s in value]
+            offsets = array("I", [0])
+            for blob in blobs:
+                offsets.append(offsets[-1] + len(blob))
+            return {"t": "strings", "blob": add(b"".join(blobs)), "offsets": encode(offsets)}
+        return {"t": "value", "v": value}
+
+    header = json.dumps({"meta": meta or {}, "tree": encode(tree)}).encode("utf-8")
+    prefix = len(MAGIC) + 4 + len(header)
+    base = prefix + (-prefix % ALIGN)
+
+    with open(path, "wb") as f:
+        f.write(MAGIC + struct.pack("<I", len(header)) + header)
+        f.write(b"\0" * (base - prefix))
+        for chunk in chunks:
+            f.write(chunk)
+    return base + size
+
+
+# -----------------------
+# Read
+# -----------------------
+
+class Store:
+    """An opened store: .meta (dict) and .tree (nested dict of views)."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a knowledge base snapshot")
+        (length,) = struct.unpack_from("<I", self._mm, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(self._mm[start:start + length])
+
+        prefix = start + length
+        self._base = prefix + (-prefix % ALIGN)
+        self._view = memoryview(self._mm)
+        self.meta = header["meta"]
+        self.tree = self._decode(header["tree"])
+
+    def _bytes(self, at):
+        offset, length = at
+        return self._view[self._base + offset:self._base + offset + length]
+
+    def _decode(self, node):
+        t = node["t"]
+        if t == "tree":
+            return {k: self._decode(v) for k, v in node["items"].items()}
+        if t == "array":
+            return self._bytes(node["at"]).cast(node["code"])
+        if t == "ndarray":
+            offset, length = node["at"]
+            dtype = np.dtype(node["dtype"])
+            return np.frombuffer(
+                self._mm, dtype=dtype, count=length // dtype.itemsize, offset=self._base + offset,
+            ).reshape(node["shape"])
+        if t == "strings":
+            return StringList(self._bytes(node["blob"]), self._decode(node["offsets"]))
+        if t == "lookup":
+            return StringIndex(self._decode(node["keys"]), self._decode(node["values"]), self._decode(node["slots"]))
+        return node["v"]
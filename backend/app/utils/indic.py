@@ -0,0 +1,103 @@
+"""
+Devanagari and romanized Hindi (Hinglish) normalisation.
+
+fold_devanagari() canonicalises spelling variants of the same Hindi word
+(NFC, nukta, long/short matras, chandrabindu). transliterate() romanizes
+Devanagari, and phonetic_key() reduces any romanized spelling to a coarse
+key that "aadhaar", "aadhar", "adhar" and "आधार" all share, so a word can
+be matched against English KB keys without a translation service.
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+
+DEVANAGARI_RE = re.compile(r"[\u0900-\u097F]")
+
+_FOLD = str.maketrans({
+    "\u0908": "\u0907", "\u090A": "\u0909",    # long -> short vowels (ii, uu)
+    "\u0940": "\u093F", "\u0942": "\u0941",    # long -> short matras
+    "\u0901": "\u0902",                      # chandrabindu -> anusvara
+    "\u093C": None,                          # nukta
+    "\u200C": None, "\u200D": None,          # zero-width (non-)joiner
+})
+
+_VOWELS = {
+    "अ": "a", "आ": "aa", "इ": "i", "ई": "ee", "उ": "u", "ऊ": "oo", "ऋ": "ri",
+    "ए": "e", "ऐ": "ai", "ओ": "o", "औ": "au", "ऑ": "o",
+}
+_MATRAS = {
+    "ा": "aa", "ि": "i", "ी": "ee", "ु": "u", "ू": "oo",
+    "ृ": "ri", "े": "e", "ै": "ai", "ो": "o", "ौ": "au",
+    "ॅ": "e", "ॉ": "o",
+}
+_CONSONANTS = {
+    "क": "k", "ख": "kh", "ग": "g", "घ": "gh", "ङ": "n",
+    "च": "ch", "छ": "chh", "ज": "j", "झ": "jh", "ञ": "n",
+    "ट": "t", "ठ": "th", "ड": "d", "ढ": "dh", "ण": "n",
+    "त": "t", "थ": "th", "द": "d", "ध": "dh", "न": "n",
+    "प": "p", "फ": "ph", "ब": "b", "भ": "bh", "म": "m",
+    "य": "y", "र": "r", "ल": "l", "व": "v",
+    "श": "sh", "ष": "sh", "स": "s", "ह": "h",
+}
+_SIGNS = {"\u0902": "n", "\u0903": "h"}          # anusvara, visarga
+_VIRAMA = "\u094D"
+_DIGITS = {chr(0x0966 + i): str(i) for i in range(10)}
+
+# romanized spelling -> phonetic key, applied in order
+_DIGRAPHS = (
+    ("chh", "C"), ("ch", "C"), ("sh", "S"), ("ph", "f"), ("ck", "k"),
+    ("c", "k"), ("q", "k"), ("w", "v"), ("z", "j"), ("x", "ks"),
+)
+_ASPIRATE_RE = re.compile(r"(?<=[bdgjkptCS])h")
+_LONG_VOWELS = (("ee", "i"), ("ii", "i"), ("oo", "u"), ("uu", "u"), ("aa", "a"))
+_REPEAT_RE = re.compile(r"(.)\1+")
+
+
+def fold_devanagari(text: str) -> str:
+    return unicodedata.normalize("NFC", text).translate(_FOLD)
+
+
+def transliterate(word: str) -> str:
+    """Romanize a Devanagari word (inherent vowels filled in, final one dropped)."""
+    out = []
+    pending = False                  # a consonant still owes its inherent "a"
+    for ch in word:
+        if ch in _CONSONANTS:
+            if pending:
+                out.append("a")
+            out.append(_CONSONANTS[ch])
+            pending = True
+        elif ch in _MATRAS:
+            out.append(_MATRAS[ch])
+            pending = False
+        elif ch == _VIRAMA:
+            pending = False
+        else:
+            if pending and ch in _SIGNS:
+                out.append("a")
+            out.append(_VOWELS.get(ch) or _SIGNS.get(ch) or _DIGITS.get(ch) or ch)
+            pending = False
+    return "".join(out)
+
+
+def phonetic_key(word: str) -> str:
+    """Coarse key shared by spelling variants of a romanized Hindi word."""
+    key = word.lower()
+    for old, new in _DIGRAPHS:
+        key = key.replace(old, new)
+    key = _ASPIRATE_RE.sub("", key)
+    for old, new in _LONG_VOWELS:
+        key = key.replace(old, new)
+    key = _REPEAT_RE.sub(r"\1", key)
+    # short and long "a" are not told apart in Hinglish, and a medial one is
+    # often dropped ("yojana" / "yojna"), so only a leading "a" is kept
+    return key[:1] + key[1:].replace("a", "")
+
+
+@lru_cache(maxsize=65536)
+def word_key(word: str) -> str:
+    """phonetic_key() of a word in either script."""
+    if DEVANAGARI_RE.search(word):
+        word = transliterate(fold_devanagari(word))
+    return phonetic_key(word)
@@ -0,0 +1,177 @@
+"""
+Minimal Prometheus metrics: counters, fixed-bucket histograms and
+scrape-time collectors, rendered in the text exposition format.
+
+Recording is a dict lookup or a bisect plus a few integer additions, a
+fraction of a microsecond, so the chat path can time every stage. Label
+values are bound once (`.labels(...)`) and the child kept, and callers
+time stages with time.perf_counter() themselves. Updates are not locked:
+the chat pipeline runs on the event loop thread.
+
+SAHAJ_METRICS=0 turns every metric into a no-op.
+"""
+
+import os
+from bisect import bisect_left
+
+ENABLED = os.environ.get("SAHAJ_METRICS", "1") != "0"
+
+# 50 us .. 10 s; the chat pipeline stages sit in the low buckets
+LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_METRICS = []
+_COLLECTORS = []
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=""):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Noop:
+    def inc(self, amount=1):
+        pass
+
+    def observe(self, value):
+        pass
+
+    def labels(self, *values):
+        return self
+
+
+NOOP = _Noop()
+
+
+class Counter:
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._children = {}
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = _CounterChild()
+        return child
+
+    def inc(self, amount=1):
+        self.labels().inc(amount)
+
+    def render(self):
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        for values, child in sorted(self._children.items()):
+            yield f"{self.name}{_labels(self.label_names, values)} {_number(child.value)}"
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+
+class Histogram:
+    def __init__(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._children = {}
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = _HistogramChild(self.buckets)
+        return child
+
+    def observe(self, value):
+        self.labels().observe(value)
+
+    def render(self):
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        for values, child in sorted(self._children.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), child.counts):
+                cumulative += count
+                le = _labels(self.label_names, values, f'le="{_number(bound)}"')
+                yield f"{self.name}_bucket{le} {cumulative}"
+            plain = _labels(self.label_names, values)
+            yield f"{self.name}_sum{plain} {_number(child.sum)}"
+            yield f"{self.name}_count{plain} {cumulative}"
+
+
+class _HistogramChild:
+    __slots__ = ("_bounds", "counts", "sum")
+
+    def __init__(self, bounds):
+        self._bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)     # last one is +Inf
+        self.sum = 0.0
+
+    def observe(self, value):
+        # bucket i counts values <= bounds[i]; cumulated at render time
+        self.counts[bisect_left(self._bounds, value)] += 1
+        self.sum += value
+
+
+def counter(name, documentation, labels=()):
+    if not ENABLED:
+        return NOOP
+    metric = Counter(name, documentation, labels)
+    _METRICS.append(metric)
+    return metric
+
+
+def histogram(name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+    if not ENABLED:
+        return NOOP
+    metric = Histogram(name, documentation, labels, buckets)
+    _METRICS.append(metric)
+    return metric
+
+
+def collector(fn):
+    """Register fn() -> iterable of exposition lines, called at scrape time."""
+    _COLLECTORS.append(fn)
+    return fn
+
+
+def sample_lines(name, documentation, kind, samples, label_names=()):
+    """Exposition lines of a counter or gauge from [(label values, value), ...]."""
+    yield f"# HELP {name} {documentation}"
+    yield f"# TYPE {name} {kind}"
+    for values, value in samples:
+        yield f"{name}{_labels(label_names, values)} {_number(value)}"
+
+
+def render() -> bytes:
+    lines = []
+    for metric in _METRICS:
+        lines.extend(metric.render())
+    if ENABLED:
+        for fn in _COLLECTORS:
+            lines.extend(fn())
+    return ("\n".join(lines) + "\n").encode("utf-8")
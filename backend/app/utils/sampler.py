@@ -0,0 +1,112 @@
+"""
+On-demand statistical profiler for a live worker.
+
+While running, a daemon thread wakes every interval, reads the stack of
+every other thread with sys._current_frames() and counts each distinct
+stack. The result is in "collapsed" form, one `frame;frame;... count` line
+per stack (root first), which flamegraph.pl, speedscope and inferno read
+directly. The profiled code is not instrumented at all; the cost is the
+sampler thread taking the GIL briefly once per interval, and nothing at all
+when no session is running.
+"""
+
+import os
+import sys
+import threading
+import time
+
+# backend/, so frames read "app/routers/chat.py" rather than a full path
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) + os.sep
+_PACKAGES = "site-packages" + os.sep
+
+
+def _short_path(path):
+    at = path.rfind(_PACKAGES)
+    if at >= 0:
+        return path[at + len(_PACKAGES):]
+    if path.startswith(_ROOT):
+        return path[len(_ROOT):]
+    return os.path.basename(path)
+
+
+class StackSampler:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._counts = {}
+        self._labels = {}                # code object -> frame label
+        self.samples = 0
+        self.interval = 0.0
+        self.started_at = None
+        self.stopped_at = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, interval=0.005, duration=30.0):
+        """Begin a new session; it stops by itself after duration seconds."""
+        with self._lock:
+            if self.running:
+                raise RuntimeError("profiler already running")
+            self._counts = {}
+            self._labels = {}
+            self.samples = 0
+            self.interval = interval
+            self.started_at = time.time()
+            self.stopped_at = None
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, args=(interval, duration), name="stack-sampler", daemon=True,
+            )
+            self._thread.start()
+
+    def stop(self):
+        """End the session (if running) and return its collapsed stacks."""
+        thread = self._thread
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+        return self.collapsed()
+
+    def _label(self, code):
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+        return label
+
+    def _run(self, interval, duration):
+        me = threading.get_ident()
+        deadline = time.monotonic() + duration
+        while not self._stop.wait(interval) and time.monotonic() < deadline:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                key = ";".join(reversed(stack))
+                self._counts[key] = self._counts.get(key, 0) + 1
+            self.samples += 1
+        self.stopped_at = time.time()
+
+    def collapsed(self):
+        counts = self._counts.copy()        # the sampler thread may still be adding
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(counts.items()))
+
+    def status(self):
+        return {
+            "running": self.running,
+            "interval_ms": self.interval * 1000,
+            "samples": self.samples,
+            "stacks": len(self._counts),
+            "started_at": self.started_at,
+            "stopped_at": self.stopped_at,
+        }
+
+
+SAMPLER = StackSampler()
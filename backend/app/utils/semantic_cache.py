@@ -0,0 +1,130 @@
+import threading
+
+import numpy as np
+
+
+class SemanticCache:
+    """
+    Answers keyed by query similarity rather than exact text.
+
+    Entries are (guard, unit vector, value). A lookup only considers entries
+    with the same guard, an exact-match key for whatever must not differ
+    between two queries sharing an answer, and returns the value of the
+    most similar one if its cosine reaches threshold. Vectors live in one
+    preallocated matrix per partition, so the check is a single
+    matrix-vector product over at most maxsize rows.
+
+    Each partition (e.g. a language) is tagged with a version (e.g. the KB
+    etag) and emptied when used with a different one. A partition
+    preallocates maxsize rows, so it is only created by set(), and at most
+    max_partitions exist; a new one replaces the oldest. When a partition is
+    full, the entry with the fewest recent hits goes, the least recently
+    used one among equals. Hit counts are halved every maxsize operations so
+    old popularity fades.
+    """
+
+    def __init__(self, maxsize=1024, threshold=0.9, dim=256, max_partitions=4):
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self.dim = dim
+        self.max_partitions = max_partitions
+        self.hits = 0
+        self.misses = 0
+        self._partitions = {}
+        self._lock = threading.Lock()
+
+    def _partition(self, name, version):
+        part = self._partitions.pop(name, None)
+        if part is None or part.version != version:
+            while len(self._partitions) >= self.max_partitions:
+                del self._partitions[next(iter(self._partitions))]
+            part = _Partition(version, self.maxsize, self.dim)
+        self._partitions[name] = part       # most recently written last
+        return part
+
+    def get(self, name, version, guard, vector, default=None):
+        with self._lock:
+            part = self._partitions.get(name)
+            slot = None
+            if part is not None and part.version == version:
+                slot = part.nearest(hash(guard), vector, self.threshold)
+            if slot is None:
+                self.misses += 1
+                return default
+            part.touch(slot)
+            self.hits += 1
+            return part.values[slot]
+
+    def set(self, name, version, guard, vector, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._partition(name, version).add(hash(guard), vector, value)
+
+    def clear(self):
+        with self._lock:
+            self._partitions.clear()
+
+    def __len__(self):
+        return sum(p.size for p in self._partitions.values())
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self),
+            "maxsize": self.maxsize,
+            "threshold": self.threshold,
+            "partitions": sorted(self._partitions),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class _Partition:
+    __slots__ = ("version", "size", "tick", "vectors", "guards", "counts", "last_used", "values")
+
+    def __init__(self, version, maxsize, dim):
+        self.version = version
+        self.size = 0
+        self.tick = 0
+        self.vectors = np.zeros((maxsize, dim), dtype=np.float32)
+        self.guards = np.zeros(maxsize, dtype=np.int64)
+        self.counts = np.zeros(maxsize, dtype=np.int64)
+        self.last_used = np.zeros(maxsize, dtype=np.int64)
+        self.values = [None] * maxsize
+
+    def _advance(self):
+        self.tick += 1
+        if self.tick % len(self.values) == 0:
+            self.counts >>= 1
+
+    def nearest(self, guard, vector, threshold):
+        n = self.size
+        if not n:
+            return None
+        same = self.guards[:n] == guard
+        if not same.any():
+            return None
+        scores = np.where(same, self.vectors[:n] @ vector, -1.0)
+        best = int(np.argmax(scores))
+        return best if scores[best] >= threshold else None
+
+    def touch(self, slot):
+        self._advance()
+        self.counts[slot] += 1
+        self.last_used[slot] = self.tick
+
+    def add(self, guard, vector, value):
+        if self.size < len(self.values):
+            slot = self.size
+            self.size += 1
+        else:
+            # fewest recent hits first, then least recently used
+            slot = int(np.lexsort((self.last_used, self.counts))[0])
+        self._advance()
+        self.vectors[slot] = vector
+        self.guards[slot] = guard
+        self.counts[slot] = 1
+        self.last_used[slot] = self.tick
+        self.values[slot] = value
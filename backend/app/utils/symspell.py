@@ -0,0 +1,118 @@
+"""
+SymSpell-style spelling correction against a fixed vocabulary.
+
+Every vocabulary word is indexed under all strings obtained by deleting up
+to max_distance of its characters. Two words within edit distance d share
+at least one such deletion, so a lookup only generates the deletions of
+the query word (a few dozen for typical words), fetches the words indexed
+under them and verifies each with a bounded edit distance. Cost depends on
+the length of the query word, not on the size of the vocabulary.
+"""
+
+from array import array
+from itertools import combinations
+
+from app.utils.binary_store import Lookup
+
+MAX_WORD_LEN = 24      # longer words are only ever matched exactly
+
+
+def deletions(word, max_distance):
+    """word plus every string made by deleting 1..max_distance characters."""
+    found = {word}
+    n = len(word)
+    for d in range(1, min(max_distance, n) + 1):
+        for drop in combinations(range(n), d):
+            found.add("".join(ch for i, ch in enumerate(word) if i not in drop))
+    return found
+
+
+def edit_distance(a, b, limit):
+    """Optimal string alignment distance, or limit + 1 once it exceeds limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2 = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        best = i
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if prev2 is not None and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+            best = min(best, cur[j])
+        if best > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return min(prev[-1], limit + 1)
+
+
+class SymSpell:
+    def __init__(self, words, max_distance=2):
+        self.max_distance = max_distance
+        self.words = sorted(set(words))
+        self._known = Lookup((w, i) for i, w in enumerate(self.words))
+
+        buckets = {}
+        for i, word in enumerate(self.words):
+            if len(word) > MAX_WORD_LEN:
+                continue
+            for deleted in deletions(word, max_distance):
+                buckets.setdefault(deleted, []).append(i)
+
+        self._deletes = Lookup()           # deletion -> slice of _candidates
+        self._offsets = array("I", [0])
+        self._candidates = array("I")
+        for deleted, ids in buckets.items():
+            self._deletes[deleted] = len(self._deletes)
+            self._candidates.extend(ids)
+            self._offsets.append(len(self._candidates))
+
+    def __len__(self):
+        return len(self.words)
+
+    def to_arrays(self):
+        return {
+            "max_distance": self.max_distance,
+            "words": self.words,
+            "known": self._known,
+            "deletes": self._deletes,
+            "offsets": self._offsets,
+            "candidates": self._candidates,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        self = cls.__new__(cls)
+        self.max_distance = arrays["max_distance"]
+        self.words = arrays["words"]
+        for name in ("known", "deletes", "offsets", "candidates"):
+            setattr(self, f"_{name}", arrays[name])
+        return self
+
+    def lookup(self, word, max_distance=None):
+        """(closest vocabulary word, distance), or None if nothing is close enough."""
+        if word in self._known:
+            return word, 0
+        limit = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        if limit <= 0 or len(word) > MAX_WORD_LEN + limit:
+            return None
+
+        best = None
+        seen = set()
+        offsets, candidates = self._offsets, self._candidates
+        for deleted in deletions(word, limit):
+            bucket = self._deletes.get(deleted)
+            if bucket is None:
+                continue
+            for i in range(offsets[bucket], offsets[bucket + 1]):
+                word_id = candidates[i]
+                if word_id in seen:
+                    continue
+                seen.add(word_id)
+                candidate = self.words[word_id]
+                d = edit_distance(word, candidate, limit if best is None else best[1])
+                if d <= limit and (best is None or d < best[1] or (d == best[1] and candidate < best[0])):
+                    best = (candidate, d)
+        return best
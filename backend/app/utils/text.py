@@ -0,0 +1,96 @@
+import re
+import zlib
+
+from app.utils.indic import DEVANAGARI_RE, fold_devanagari
+
+TOKEN_RE = re.compile(r"[\w\u0900-\u097F]+")
+
+STOPWORDS = frozenset([
+    "a", "an", "and", "are", "as", "at", "be", "can", "do", "does", "for", "from",
+    "get", "i", "in", "is", "it", "me", "my", "of", "on", "or", "the", "to", "what",
+    "which", "who", "with", "you",
+])
+
+
+def normalize(text: str) -> str:
+    text = " ".join(text.lower().split())
+    # one spelling per Devanagari word (NFC, nukta and matra length folded)
+    return text if text.isascii() else fold_devanagari(text)
+
+
+def words(text: str):
+    return TOKEN_RE.findall(text.lower())
+
+
+def tokenize(text: str):
+    return [t for t in words(text) if t not in STOPWORDS]
+
+
+def token_ngram_hashes(tokens, sizes=(3, 4)):
+    """Stable crc32 hashes of the character n-grams of each token."""
+    hashes = []
+    for token in tokens:
+        padded = f" {token} "
+        for n in sizes:
+            for i in range(len(padded) - n + 1):
+                hashes.append(zlib.crc32(padded[i:i + n].encode("utf-8")))
+    return hashes
+
+
+def char_ngram_hashes(text: str, sizes=(3, 4)):
+    return token_ngram_hashes(tokenize(text), sizes)
+
+
+# -----------------------
+# Parsed query
+# -----------------------
+
+class ParsedQuery:
+    """
+    A message normalised and tokenised once, shared by every pipeline stage
+    (intent ranking, keyword matching, BM25, vector search).
+    """
+
+    __slots__ = ("text", "words", "tokens", "language", "_ngram_hashes", "_lookups")
+
+    def __init__(self, text: str, language: str | None = None):
+        # text must already be normalize()d
+        self.text = text
+        self.words = tuple(TOKEN_RE.findall(text))
+        self.tokens = tuple(w for w in self.words if w not in STOPWORDS)
+        self.language = "hi" if DEVANAGARI_RE.search(text) else (language or "en")
+        self._ngram_hashes = None
+        self._lookups = None
+
+    @property
+    def ngram_hashes(self):
+        # only vector search needs these, so they are computed on first use
+        if self._ngram_hashes is None:
+            self._ngram_hashes = tuple(token_ngram_hashes(self.tokens))
+        return self._ngram_hashes
+
+    def memo(self, key, compute):
+        """
+        compute(), run once per query and key. Key matches and spelling
+        corrections are asked for by several stages of one answer; keys
+        start with the index that computed them, so a query parsed before
+        a reload never gets the old snapshot's results.
+        """
+        if self._lookups is None:
+            self._lookups = {}
+        try:
+            return self._lookups[key]
+        except KeyError:
+            value = self._lookups[key] = compute()
+            return value
+
+    def __repr__(self):
+        return f"ParsedQuery({self.text!r}, language={self.language!r})"
+
+
+def parse_query(message: str, language: str | None = None) -> ParsedQuery:
+    return ParsedQuery(normalize(message), language)
+
+
+def as_query(query) -> ParsedQuery:
+    return query if isinstance(query, ParsedQuery) else parse_query(query)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Throughput of N single-message POSTs vs one POST /api/chat/batch.
+
+The response cache is cleared before every run so both sides do the full
+split / intent / lookup work.
+
+Usage (from backend/):
+    python -m benchmarks.bench_batch [messages]
+"""
+
+import asyncio
+import random
+import sys
+import time
+
+import httpx
+
+from app.main import app
+from app.routers.chat import RESPONSE_CACHE
+
+TEMPLATES = [
+    "hi",
+    "what documents are required for aadhaar",
+    "what is pm awas yojana",
+    "documents for pm awas? where is the csc office",
+    "tell me about ration card {n}",
+    "aadhaar update process {n}",
+]
+
+
+def workload(n, seed=0):
+    rng = random.Random(seed)
+    return [
+        {"message": rng.choice(TEMPLATES).format(n=rng.randint(1, n // 4 or 1)), "language": rng.choice(["en", "hi"])}
+        for _ in range(n)
+    ]
+
+
+async def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    items = workload(n)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        RESPONSE_CACHE.clear()
+        start = time.perf_counter()
+        singles = [(await client.post("/api/chat/", json=item)).json() for item in items]
+        single_s = time.perf_counter() - start
+
+        RESPONSE_CACHE.clear()
+        start = time.perf_counter()
+        batch = (await client.post("/api/chat/batch", json=items)).json()
+        batch_s = time.perf_counter() - start
+
+    assert batch == singles
+    print(f"messages={n} distinct={len({(i['message'], i['language']) for i in items})}")
+    print(f"single endpoint  {n / single_s:10.0f} msg/s  ({single_s * 1e3:.1f} ms)")
+    print(f"batch endpoint   {n / batch_s:10.0f} msg/s  ({batch_s * 1e3:.1f} ms)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
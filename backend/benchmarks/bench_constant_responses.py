@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Per-request cost of a constant reply: building a ChatResponse and letting
+FastAPI validate + serialise it through response_model, vs returning the
+pre-rendered bytes.
+
+Usage (from backend/):
+    python -m benchmarks.bench_constant_responses
+"""
+
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from app.schemas.chat import ChatResponse
+from app.services.responses import constant_body, json_response
+
+REQUESTS = 2_000
+ANSWER = (
+    "Hello! 👋 I’m SahajAI.\n\nI can help you with:\n• Government schemes\n• Required documents\n"
+    "• Office guidance (Tehsil, CSC, Jan Seva Kendra)\n• Step-by-step form filling\n\n"
+    "How can I assist you today?"
+)
+
+app = FastAPI()
+
+
+@app.get("/model", response_model=ChatResponse)
+async def model():
+    return ChatResponse(mode="answer", intent="unknown", language="en", answer=ANSWER, confidence=0.9)
+
+
+@app.get("/bytes", response_model=ChatResponse)
+async def prebuilt():
+    return json_response(constant_body("greeting", "en"))
+
+
+async def run(client, path):
+    await client.get(path)  # warm up
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        await client.get(path)
+    return (time.perf_counter() - start) / REQUESTS * 1e6
+
+
+async def main():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        model_us = await run(client, "/model")
+        bytes_us = await run(client, "/bytes")
+    print(f"ChatResponse + response_model  {model_us:8.1f} us/request")
+    print(f"pre-rendered bytes             {bytes_us:8.1f} us/request")
+    print(f"saved                          {model_us - bytes_us:8.1f} us/request")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+"Which schemes am I eligible for": compiled bitsets vs evaluating every
+scheme's parsed rules per profile.
+
+Usage (from backend/):
+    python -m benchmarks.bench_eligibility [schemes]
+"""
+
+import random
+import sys
+import time
+
+from app.services.eligibility import EligibilityIndex, compile_rules
+from benchmarks.synthetic import STATES, knowledge_base
+
+PROFILES = 500
+
+
+def accepts(rules, profile):
+    """Reference check of one scheme's parsed rules against a profile."""
+    if profile.get("citizen") is False and rules.get("citizen"):
+        return False
+    if profile.get("owns_pucca_house") and rules.get("owns_pucca_house") is False:
+        return False
+    if profile.get("state") and "state" in rules and profile["state"] not in rules["state"]:
+        return False
+    for field in ("annual_income", "age"):
+        value = profile.get(field)
+        if value is not None and field in rules:
+            low, high = rules[field]
+            if not low <= value < high:
+                return False
+    return True
+
+
+def random_profile(rng):
+    profile = {}
+    if rng.random() < 0.8:
+        profile["annual_income"] = rng.choice([50_000, 120_000, 250_000, 300_000, 600_000, 1_200_000])
+    if rng.random() < 0.8:
+        profile["age"] = rng.randint(16, 80)
+    if rng.random() < 0.6:
+        profile["state"] = rng.choice(STATES)
+    if rng.random() < 0.5:
+        profile["owns_pucca_house"] = rng.random() < 0.5
+    return profile
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    _, schemes = knowledge_base(n)
+
+    start = time.perf_counter()
+    index = EligibilityIndex(schemes)
+    print(f"schemes={n} predicates={index.parsed} build={time.perf_counter() - start:.2f}s")
+
+    rules = [compile_rules(value["eligibility"]) for value in schemes.values()]
+    keys = list(schemes)
+    rng = random.Random(1)
+    profiles = [random_profile(rng) for _ in range(PROFILES)]
+
+    start = time.perf_counter()
+    masks = [index.mask(**p) for p in profiles]
+    print(f"bitset mask     {(time.perf_counter() - start) / PROFILES * 1e6:10.1f} us/profile")
+
+    start = time.perf_counter()
+    top = [index.match(10, **p) for p in profiles]
+    print(f"bitset + top 10 {(time.perf_counter() - start) / PROFILES * 1e6:10.1f} us/profile")
+
+    start = time.perf_counter()
+    matched = [index.keys_of(m) for m in masks]
+    print(f"all keys        {(time.perf_counter() - start) / PROFILES * 1e6:10.1f} us/profile")
+
+    sample = profiles[:20]
+    start = time.perf_counter()
+    expected = [[k for k, r in zip(keys, rules) if accepts(r, p)] for p in sample]
+    print(f"per-scheme scan {(time.perf_counter() - start) / len(sample) * 1e6:10.1f} us/profile")
+
+    assert expected == matched[:len(sample)], "bitset result differs from the scan"
+    assert all(count == len(keys) for (count, _), keys in zip(top, matched))
+    hits = sum(m.bit_count() for m in masks) / PROFILES
+    print(f"avg eligible    {hits:10.0f} schemes/profile")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Typo-tolerant key lookup: SymSpell deletion index vs edit distance against
+every key, on misspelt mentions of synthetic scheme names, then the
+deletion index alone over a vocabulary of as many distinct words.
+
+Usage (from backend/):
+    python -m benchmarks.bench_fuzzy_lookup [keys]
+"""
+
+import random
+import sys
+import time
+
+from app.services.search_service import SearchIndex
+from app.utils.symspell import SymSpell, edit_distance
+from benchmarks.synthetic import knowledge_base
+
+QUERIES = 500
+BRUTE_FORCE_QUERIES = 3
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+
+def misspell(word, rng):
+    i = rng.randrange(len(word))
+    edit = rng.choice(("delete", "replace", "insert", "swap"))
+    if edit == "delete":
+        return word[:i] + word[i + 1:]
+    if edit == "replace":
+        return word[:i] + rng.choice(LETTERS) + word[i + 1:]
+    if edit == "insert":
+        return word[:i] + rng.choice(LETTERS) + word[i:]
+    i = min(i, len(word) - 2)
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def typo_query(key, rng):
+    words = key.split()
+    long_words = [i for i, w in enumerate(words) if len(w) >= 4 and not w.isdigit()]
+    if long_words:
+        i = rng.choice(long_words)
+        words[i] = misspell(words[i], rng)
+    return "documents for " + " ".join(words)
+
+
+def brute_force(keys, query):
+    text_words = query.split()
+    best = None
+    for key in keys:
+        n = len(key.split())
+        for i in range(len(text_words) - n + 1):
+            d = edit_distance(" ".join(text_words[i:i + n]), key, 2)
+            if d <= 2 and (best is None or d < best[1]):
+                best = (key, d)
+    return best
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    documents, schemes = knowledge_base(n)
+
+    start = time.perf_counter()
+    index = SearchIndex(documents, schemes)
+    print(f"keys={len(documents) + len(schemes)} vocabulary={len(index._spell)} build={time.perf_counter() - start:.1f}s")
+
+    rng = random.Random(1)
+    keys = list(schemes)
+    targets = [rng.choice(keys) for _ in range(QUERIES)]
+    queries = [typo_query(key, rng) for key in targets]
+
+    start = time.perf_counter()
+    results = [index.match_keys(q, "scheme") for q in queries]
+    per_query = (time.perf_counter() - start) / QUERIES * 1e6
+    found = sum(
+        any(index.entry(entry_id)[1] == key for entry_id, _ in hits[:1])
+        for key, hits in zip(targets, results)
+    )
+    print(f"deletion index {per_query:10.1f} us/query   top-1 recall {found / QUERIES:.0%}")
+
+    start = time.perf_counter()
+    for q in queries[:BRUTE_FORCE_QUERIES]:
+        brute_force(keys, q)
+    per_query = (time.perf_counter() - start) / BRUTE_FORCE_QUERIES * 1e6
+    print(f"brute force    {per_query:10.1f} us/query")
+
+    vocabulary = list({"".join(rng.choice(LETTERS) for _ in range(rng.randint(5, 10))) for _ in range(n)})
+    start = time.perf_counter()
+    spell = SymSpell(vocabulary, 2)
+    print(f"words={len(spell)} build={time.perf_counter() - start:.1f}s")
+
+    targets = [rng.choice(vocabulary) for _ in range(QUERIES)]
+    typos = [misspell(word, rng) for word in targets]
+    start = time.perf_counter()
+    hits = [spell.lookup(word) for word in typos]
+    per_query = (time.perf_counter() - start) / QUERIES * 1e6
+    found = sum(hit is not None and hit[0] == word for hit, word in zip(hits, targets))
+    print(f"word lookup    {per_query:10.1f} us/query   top-1 recall {found / QUERIES:.0%}")
+
+    start = time.perf_counter()
+    for word in typos[:BRUTE_FORCE_QUERIES]:
+        min(vocabulary, key=lambda v: edit_distance(word, v, 2))
+    per_query = (time.perf_counter() - start) / BRUTE_FORCE_QUERIES * 1e6
+    print(f"brute force    {per_query:10.1f} us/query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Memory per KB entry: entries as parsed JSON dicts vs compact records
+(__slots__, interned strings, tuples).
+
+Usage (from backend/):
+    python -m benchmarks.bench_kb_memory [schemes]
+"""
+
+import gc
+import json
+import sys
+import tracemalloc
+
+from app.services.records import DocumentRecord, OfficeRecord, SchemeRecord, compact_entries
+from benchmarks.synthetic import knowledge_base, offices
+
+
+def measure(build):
+    """Bytes still allocated by build() once its result is the only thing alive."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    documents, schemes = knowledge_base(n)
+    raw = {
+        "documents": json.dumps(documents),
+        "schemes": json.dumps(schemes),
+        "offices": json.dumps(offices(n)),
+    }
+    records = {"documents": DocumentRecord, "schemes": SchemeRecord, "offices": OfficeRecord}
+
+    def as_records(name):
+        data = json.loads(raw[name])
+        if name == "offices":
+            return [OfficeRecord.from_dict(o) for o in data]
+        return compact_entries(data, records[name])
+
+    print(f"{'collection':<10} {'entries':>8} {'dict B/entry':>13} {'record B/entry':>15} {'saved':>6}")
+    for name in raw:
+        plain, before = measure(lambda: json.loads(raw[name]))
+        count = len(plain)
+        del plain
+        compacted, after = measure(lambda: as_records(name))
+        del compacted
+        print(f"{name:<10} {count:>8} {before / count:>13.0f} {after / count:>15.0f} {1 - after / before:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
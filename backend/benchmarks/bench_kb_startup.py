@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Worker startup: parse + index the JSON knowledge base vs map the binary
+snapshot, at growing KB sizes. Also times the first query after startup,
+which on the snapshot path includes faulting in the pages it touches.
+
+Usage (from backend/):
+    python -m benchmarks.bench_kb_startup
+"""
+
+import json
+import os
+import tempfile
+import time
+
+os.environ.setdefault("SAHAJ_INDEX_DIR", tempfile.mkdtemp())
+
+from app.services.knowledge_service import KnowledgeBase  # noqa: E402
+from app.utils.binary_store import Store, write_store  # noqa: E402
+from benchmarks.synthetic import knowledge_base, offices  # noqa: E402
+
+SIZES = [100, 1_000, 10_000, 50_000]
+QUERY = "documents required for pm awas yojana"
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    print(f"{'entries':>8} {'json ms':>9} {'snapshot ms':>12} {'1st query json':>15} {'1st query snap':>15} {'file MiB':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in SIZES:
+            documents, schemes = knowledge_base(size)
+            raw = json.dumps({"documents": documents, "schemes": schemes, "offices": offices(size)})
+
+            def from_json():
+                data = json.loads(raw)
+                return KnowledgeBase(1, "bench", data["documents"], data["schemes"], data["offices"])
+
+            kb, json_ms = timed(from_json)
+            path = os.path.join(tmp, f"kb-{size}.snapshot")
+            write_store(path, kb.to_arrays(), {"etag": "bench"})
+
+            mapped, snap_ms = timed(lambda: KnowledgeBase.from_store(1, Store(path)))
+            _, json_q = timed(lambda: kb.search(QUERY))
+            _, snap_q = timed(lambda: mapped.search(QUERY))
+            print(
+                f"{len(documents) + len(schemes):>8} {json_ms:>9.1f} {snap_ms:>12.2f} "
+                f"{json_q:>12.2f} ms {snap_q:>12.2f} ms {os.path.getsize(path) / 2**20:>9.1f}"
+            )
+            del mapped
+
+
+if __name__ == "__main__":
+    main()
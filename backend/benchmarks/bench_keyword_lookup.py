@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Keyword lookup benchmark: linear substring scan vs Aho-Corasick.
+
+Usage (from backend/):
+    python -m benchmarks.bench_keyword_lookup
+"""
+
+import timeit
+
+from app.utils.aho_corasick import AhoCorasick
+from benchmarks.synthetic import scheme_names
+
+SIZES = [10, 100, 1_000, 10_000, 100_000]
+MESSAGE = "what documents are required for pm awas yojana and where is the nearest csc office"
+
+
+def linear_scan(keys, text):
+    return [k for k in keys if k in text]
+
+
+def bench(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    print(f"{'keys':>8} {'build s':>9} {'scan us':>10} {'automaton us':>13}")
+    for size in SIZES:
+        keys = scheme_names(size)
+        build = min(timeit.repeat(lambda: AhoCorasick(keys), number=1, repeat=1))
+        matcher = AhoCorasick(keys)
+
+        scan_us = bench(lambda: linear_scan(keys, MESSAGE), max(1, 100_000 // size))
+        ac_us = bench(lambda: matcher.find_all(MESSAGE), 2_000)
+        print(f"{size:>8} {build:>9.2f} {scan_us:>10.1f} {ac_us:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+LLMClient against the local stub server: keep-alive pooling, singleflight
+coalescing, the concurrency cap and latency-budget fallback.
+
+Usage (from backend/):
+    python -m benchmarks.bench_llm_client
+"""
+
+import asyncio
+import socket
+import threading
+import time
+
+import httpx
+import uvicorn
+
+from app.services.llm_service import LLMClient
+from benchmarks import llm_stub
+
+SEQUENTIAL = 200
+CONCURRENT = 100
+
+
+def start_stub():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(llm_stub.app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return f"http://127.0.0.1:{port}/v1"
+
+
+async def timed(coro):
+    start = time.perf_counter()
+    result = await coro
+    return result, (time.perf_counter() - start) * 1e3
+
+
+async def main(url):
+    payload = {"model": "stub", "messages": [{"role": "user", "content": "hi"}]}
+
+    # connection reuse: pooled client vs a new connection per call
+    llm_stub.app.state.delay_ms = 0
+    client = LLMClient(url, "stub", concurrency=8)
+
+    async def pooled_calls():
+        for i in range(SEQUENTIAL):
+            await client.complete(f"q{i}")
+
+    async def unpooled():
+        for _ in range(SEQUENTIAL):
+            async with httpx.AsyncClient(base_url=url) as http:
+                (await http.post("/chat/completions", json=payload)).raise_for_status()
+
+    _, pooled = await timed(pooled_calls())
+    _, fresh = await timed(unpooled())
+    print(f"pooled keep-alive    {pooled / SEQUENTIAL:8.2f} ms/call")
+    print(f"new connection each  {fresh / SEQUENTIAL:8.2f} ms/call")
+
+    # singleflight: identical prompts in flight share one upstream call
+    llm_stub.app.state.delay_ms = 100
+    client = LLMClient(url, "stub", concurrency=8)
+    answers, elapsed = await timed(asyncio.gather(*[client.complete("same prompt") for _ in range(CONCURRENT)]))
+    assert len(set(answers)) == 1
+    print(f"{CONCURRENT} identical prompts  {elapsed:8.1f} ms, upstream calls={client.calls}, "
+          f"coalesced={client.coalesced}")
+
+    # concurrency cap: distinct prompts run at most 8 at a time
+    _, elapsed = await timed(asyncio.gather(*[client.complete(f"p{i}") for i in range(CONCURRENT)]))
+    print(f"{CONCURRENT} distinct prompts   {elapsed:8.1f} ms at concurrency 8 "
+          f"(~{CONCURRENT / 8 * 100:.0f} ms expected)")
+
+    # budget: a slow upstream falls back instead of holding the request
+    llm_stub.app.state.delay_ms = 500
+    client = LLMClient(url, "stub", concurrency=8)
+    answers, elapsed = await timed(asyncio.gather(*[client.complete(f"s{i}", budget_ms=150) for i in range(8)]))
+    print(f"slow upstream        {elapsed:8.1f} ms with a 150 ms budget, fallbacks={answers.count(None)}/8")
+    await asyncio.sleep(0.5)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(start_stub()))
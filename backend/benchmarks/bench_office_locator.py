@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Nearest-office queries on a synthetic national office registry.
+
+Usage (from backend/):
+    python -m benchmarks.bench_office_locator [offices]
+"""
+
+import random
+import sys
+import time
+
+from app.services.office_service import OfficeIndex
+from benchmarks.synthetic import offices
+
+QUERIES = 2_000
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    records = offices(n)
+
+    start = time.perf_counter()
+    index = OfficeIndex(records)
+    print(f"offices={n} build={time.perf_counter() - start:.2f}s")
+
+    rng = random.Random(1)
+    points = [(rng.uniform(8.0, 37.0), rng.uniform(68.0, 97.0)) for _ in range(QUERIES)]
+    pincodes = [rng.choice(records)["pincode"] for _ in range(QUERIES)]
+
+    for label, office_type in (("any", None), ("csc", "csc"), ("tehsil", "tehsil"), ("aadhaar", "aadhaar")):
+        start = time.perf_counter()
+        for lat, lon in points:
+            index.nearest(lat, lon, 5, office_type)
+        per_query = (time.perf_counter() - start) / QUERIES * 1e6
+        print(f"nearest 5 {label:<8} {per_query:8.1f} us/query")
+
+    start = time.perf_counter()
+    for pincode in pincodes:
+        index.nearest_to_pincode(pincode, 3, "csc")
+    print(f"by pincode (csc) {(time.perf_counter() - start) / QUERIES * 1e6:8.1f} us/query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Cost of the on-demand stack sampler on the chat pipeline: answer()
+throughput with no session running vs sampling at a few intervals.
+
+The sampler needs the GIL to read the stacks, so a busy thread is only
+interrupted every sys.getswitchinterval() (5 ms by default) at most,
+whatever the requested interval.
+
+Usage (from backend/):
+    python -m benchmarks.bench_sampler_overhead
+"""
+
+import sys
+import time
+
+from app.routers import chat
+from app.services.knowledge_service import snapshot
+from app.utils.sampler import StackSampler
+from app.utils.text import normalize
+
+MESSAGES = [
+    "what documents are required for aadhaar",
+    "what is pm awas yojana and where is the csc office",
+    "nearest csc 110001",
+    "blah blah something else",
+]
+ROUNDS = 5
+REQUESTS = 4_000
+INTERVALS_MS = (20, 5, 1)
+
+
+def per_request(kb, keys):
+    start = time.perf_counter()
+    for i in range(REQUESTS):
+        chat.answer_many([keys[i % len(keys)]], kb)
+    return (time.perf_counter() - start) / REQUESTS * 1e6
+
+
+def main():
+    kb = snapshot()
+    keys = [(normalize(m), "en") for m in MESSAGES]
+    per_request(kb, keys)                       # warm up
+    print(f"switch interval       {sys.getswitchinterval() * 1000:6.1f} ms")
+
+    # alternate the configurations so drift hits all alike
+    results = {None: []}
+    results.update({ms: [] for ms in INTERVALS_MS})
+    samples = {}
+    for _ in range(ROUNDS):
+        results[None].append(per_request(kb, keys))
+        for ms in INTERVALS_MS:
+            sampler = StackSampler()
+            sampler.start(ms / 1000, duration=60)
+            results[ms].append(per_request(kb, keys))
+            sampler.stop()
+            samples[ms] = sampler.status()["samples"]
+
+    baseline = min(results[None])
+    print(f"no session            {baseline:8.2f} us/request")
+    for ms in INTERVALS_MS:
+        best = min(results[ms])
+        print(f"sampling every {ms:>2} ms  {best:8.2f} us/request "
+              f"({(best / baseline - 1) * 100:+5.1f}%, {samples[ms]} samples in last run)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Scaling curves of the hot lookup functions on synthetic catalogues:
+detect_intent, split_questions, get_document_info and get_scheme_info,
+swept over KB size (schemes and documents each) and message length.
+
+Messages either name catalogue entries ("hit") or name nothing ("miss");
+a miss falls through the keyword automaton to the typo-tolerant index, so
+both paths get a curve.
+
+For each function the log-log slope of time against KB size (at the
+longest message) and against message length (at the largest KB) is fitted.
+The lookups are meant to be independent of KB size and linear in message
+length; a slope above SLOPE_LIMITS is reported as a violation and the run
+exits with status 1.
+
+Building the 100k KB takes about a minute.
+
+Usage (from backend/):
+    python -m benchmarks.bench_scaling [--sizes 10,100,1000,10000,100000] [--words 8,32,128,512] [--out curves.json]
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+
+# every synthetic KB persists a vector index; keep them out of app/data
+os.environ.setdefault("SAHAJ_INDEX_DIR", tempfile.mkdtemp())
+
+from app.services import knowledge_service  # noqa: E402
+from app.services.intent_router import detect_intent, split_questions  # noqa: E402
+from app.services.knowledge_service import KnowledgeBase  # noqa: E402
+from benchmarks.synthetic import knowledge_base, messages  # noqa: E402
+
+FUNCTIONS = {
+    "detect_intent": detect_intent,
+    "split_questions": split_questions,
+    "get_document_info": knowledge_service.get_document_info,
+    "get_scheme_info": knowledge_service.get_scheme_info,
+}
+# (max slope vs KB size, max slope vs message length)
+SLOPE_LIMITS = (0.3, 1.3)
+MESSAGES = 100
+REPEAT = 3
+
+
+def per_call(fn, batch):
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        for message in batch:
+            fn(message)
+        best = min(best, time.perf_counter() - start)
+    return best / len(batch) * 1e6
+
+
+def slope(points):
+    """Least-squares slope of log(us) against log(x)."""
+    xs = [math.log(x) for x, _ in points]
+    ys = [math.log(max(y, 1e-3)) for _, y in points]
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    spread = sum((x - mx) ** 2 for x in xs)
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / spread if spread else 0.0
+
+
+def sweep(sizes, lengths):
+    curves = []
+    live = knowledge_service._SNAPSHOT
+    try:
+        for size in sizes:
+            documents, schemes = knowledge_base(size, size)
+            start = time.perf_counter()
+            kb = knowledge_service._SNAPSHOT = KnowledgeBase(1, "bench", documents, schemes, [])
+            print(f"kb size={size:<7} build={time.perf_counter() - start:6.1f}s", flush=True)
+
+            names = list(kb.documents) + list(kb.schemes)
+            for words in lengths:
+                batches = {
+                    "hit": messages(names, words, MESSAGES, seed=size),
+                    "miss": messages([], words, MESSAGES, seed=size),
+                }
+                for lookup, batch in batches.items():
+                    row = {name: per_call(fn, batch) for name, fn in FUNCTIONS.items()}
+                    print(f"  {words:>4} words {lookup:<4} " + "  ".join(f"{n} {us:8.1f}us" for n, us in row.items()),
+                          flush=True)
+                    curves += [
+                        {"function": name, "lookup": lookup, "kb_size": size, "words": words, "us": round(us, 2)}
+                        for name, us in row.items()
+                    ]
+    finally:
+        knowledge_service._SNAPSHOT = live
+    return curves
+
+
+def fit(curves, sizes, lengths):
+    slopes, violations = [], []
+    for name in FUNCTIONS:
+        for lookup in ("hit", "miss"):
+            rows = [c for c in curves if c["function"] == name and c["lookup"] == lookup]
+            by_size = slope([(c["kb_size"], c["us"]) for c in rows if c["words"] == lengths[-1]])
+            by_length = slope([(c["words"], c["us"]) for c in rows if c["kb_size"] == sizes[-1]])
+            slopes.append({"function": name, "lookup": lookup,
+                           "kb_size": round(by_size, 3), "words": round(by_length, 3)})
+            if len(sizes) > 1 and by_size > SLOPE_LIMITS[0]:
+                violations.append(f"{name} ({lookup}) grows as KB size^{by_size:.2f}")
+            if len(lengths) > 1 and by_length > SLOPE_LIMITS[1]:
+                violations.append(f"{name} ({lookup}) grows as message length^{by_length:.2f}")
+    return slopes, violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default="10,100,1000,10000,100000")
+    parser.add_argument("--words", default="8,32,128,512")
+    parser.add_argument("--out", help="write the curves and slopes here as JSON")
+    args = parser.parse_args()
+    sizes = sorted(int(s) for s in args.sizes.split(","))
+    lengths = sorted(int(w) for w in args.words.split(","))
+
+    curves = sweep(sizes, lengths)
+    slopes, violations = fit(curves, sizes, lengths)
+
+    print(f"\n{'log-log slope':<32} {'vs KB size':>10} {'vs length':>10}")
+    for s in slopes:
+        print(f"{s['function'] + ' (' + s['lookup'] + ')':<32} {s['kb_size']:10.2f} {s['words']:10.2f}")
+    for violation in violations:
+        print(f"VIOLATION: {violation}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"sizes": sizes, "words": lengths, "limits": SLOPE_LIMITS, "curves": curves,
+                       "slopes": slopes, "violations": violations}, f, indent=2)
+            f.write("\n")
+    sys.exit(1 if violations else 0)
+
+
+if __name__ == "__main__":
+    main()
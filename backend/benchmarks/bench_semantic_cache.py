@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Semantic answer cache: hit ratio and correctness on rephrased questions,
+and the cost of a lookup in a full partition.
+
+Every hit is checked against the answer computed from scratch, so a
+threshold that lets wrong answers through shows up as "wrong" > 0.
+
+Usage (from backend/):
+    python -m benchmarks.bench_semantic_cache [threshold]
+"""
+
+import random
+import sys
+import time
+
+import numpy as np
+
+from app.routers import chat
+from app.services.knowledge_service import snapshot
+from app.utils.semantic_cache import SemanticCache
+from app.utils.text import normalize
+
+TEMPLATES = [
+    "documents for {}", "docs for {}", "{} papers needed", "what documents are required for {}",
+    "which documents do i need for {}", "{} documents", "paperwork for {}", "{} required documents",
+    "what is {}", "tell me about {}", "{} scheme benefits", "where is the office for {}",
+    "nearest office for {}", "{} office address",
+]
+LOOKUPS = 2_000
+
+
+def main():
+    threshold = float(sys.argv[1]) if len(sys.argv) > 1 else chat.SEMANTIC_CACHE.threshold
+    kb = snapshot()
+    cache = chat.SEMANTIC_CACHE = SemanticCache(1024, threshold, chat.SEMANTIC_CACHE.dim)  # on even without an LLM
+
+    names = list(kb.documents) + list(kb.schemes)
+    rng = random.Random(0)
+    messages = [normalize(rng.choice(TEMPLATES).format(rng.choice(names))) for _ in range(500)]
+
+    hits = wrong = computed = 0
+    key_time = 0.0
+    for message in messages:
+        start = time.perf_counter()
+        semantic = chat.semantic_key(message, "en", kb)
+        key_time += time.perf_counter() - start
+        expected = chat.answer(message, "en", kb)
+        if semantic is None:
+            continue
+        computed += 1
+        body = cache.get("en", kb.etag, *semantic)
+        if body is None:
+            cache.set("en", kb.etag, *semantic, expected)
+            continue
+        hits += 1
+        wrong += body != expected
+    print(f"threshold={threshold} messages={len(messages)} shareable={computed} "
+          f"hits={hits} ({hits / max(computed, 1):.0%}) wrong={wrong}")
+    print(f"semantic_key          {key_time / len(messages) * 1e6:8.1f} us/message")
+
+    start = time.perf_counter()
+    for message in messages[:200]:
+        chat.answer(message, "en", kb)
+    print(f"answer() from scratch {(time.perf_counter() - start) / 200 * 1e6:8.1f} us/message")
+
+    # lookup cost in a full partition, all sharing one guard (the worst case)
+    full = SemanticCache(1024, threshold, cache.dim)
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((1024 + LOOKUPS, cache.dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    for i in range(1024):
+        full.set("en", 1, "guard", vectors[i], b"")
+    start = time.perf_counter()
+    for vector in vectors[1024:]:
+        full.get("en", 1, "guard", vector)
+    print(f"lookup, 1024 entries  {(time.perf_counter() - start) / LOOKUPS * 1e6:8.1f} us/lookup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+split_questions on long (~10 KB) messages: repeated str.split vs the
+precompiled splitter.
+
+Usage (from backend/):
+    python -m benchmarks.bench_split_questions
+"""
+
+import timeit
+
+from app.services.intent_router import iter_questions, split_questions
+
+SENTENCE = "what documents are required for aadhaar? where is the csc office how do i apply for pm awas yojana "
+HINDI = "आधार के लिए दस्तावेज़ और नज़दीकी CSC कहाँ है। पीएम आवास योजना क्या है? "
+
+
+def split_by_separators(message):
+    separators = ["?", " what ", " where ", " how "]
+    questions = [message]
+    for sep in separators:
+        new = []
+        for q in questions:
+            new.extend(q.split(sep))
+        questions = new
+    return [q.strip() for q in questions if len(q.strip()) > 5]
+
+
+def bench(fn, number=200):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    for name, unit, lang in (("en", SENTENCE, "en"), ("hi", HINDI, "hi")):
+        message = unit * (10_240 // len(unit.encode("utf-8")) + 1)
+        print(f"[{name}] {len(message.encode('utf-8'))} bytes, {len(split_questions(message, lang))} fragments")
+        if lang == "en":
+            print(f"  str.split chain   {bench(lambda: split_by_separators(message)):9.1f} us")
+        print(f"  split_questions   {bench(lambda: split_questions(message, lang)):9.1f} us")
+        print(f"  first fragment    {bench(lambda: next(iter_questions(message, lang)), 5_000):9.2f} us")
+
+
+if __name__ == "__main__":
+    main()
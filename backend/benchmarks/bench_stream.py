@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Time to first answer vs full answer on the SSE endpoint, read from the
+elapsed_ms the server stamps on each event.
+
+Usage (from backend/):
+    python -m benchmarks.bench_stream
+"""
+
+import json
+import statistics
+import warnings
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.routers.chat import RESPONSE_CACHE
+
+MESSAGE = "what documents are required for aadhaar? what is pm awas yojana? where is the csc office how do i apply"
+RUNS = 200
+
+
+def events(text):
+    for block in text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        yield lines["event"], json.loads(lines["data"])
+
+
+def main():
+    warnings.simplefilter("ignore")
+    client = TestClient(app)
+    first, full = [], []
+
+    for _ in range(RUNS):
+        RESPONSE_CACHE.clear()
+        text = client.post("/api/chat/stream", json={"message": MESSAGE}).text
+        stamps = [(event, data["elapsed_ms"]) for event, data in events(text)]
+        first.append(stamps[0][1])
+        full.append(stamps[-1][1])
+
+    print(f"events per response   {len(stamps)}")
+    print(f"first event  p50 {statistics.median(first):.3f} ms")
+    print(f"done event   p50 {statistics.median(full):.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Vector search latency on a synthetic catalogue, and recall on mentions of
+entry names with a typo.
+
+Usage (from backend/):
+    python -m benchmarks.bench_vector_search [entries]
+"""
+
+import random
+import sys
+import tempfile
+import timeit
+
+from app.services.vector_service import VectorIndex
+from benchmarks.bench_fuzzy_lookup import misspell
+from benchmarks.synthetic import scheme_names
+
+QUERIES = ["housing scheme for the poor", "pension for kisan farmers", "kanya vidya scholarship for girls"]
+RECALL_QUERIES = 500
+
+
+def typo_mention(name, rng):
+    words = name.split()
+    long_words = [i for i, w in enumerate(words) if len(w) >= 4 and not w.isdigit()]
+    if long_words:
+        i = rng.choice(long_words)
+        words[i] = misspell(words[i], rng)
+    return "tell me about " + " ".join(words)
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    schemes = {name: {"description": f"{name} scheme"} for name in scheme_names(size)}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = timeit.default_timer()
+        index = VectorIndex.build({}, schemes, index_dir=tmp)
+        print(f"entries={len(index)} build={timeit.default_timer() - start:.2f}s")
+
+        for query in QUERIES:
+            number = 200
+            per_query = min(timeit.repeat(lambda: index.search(query, 5), number=number, repeat=5)) / number
+            hits = index.search(query, 1)
+            print(f"{per_query * 1e3:8.3f} ms  {query!r} -> {hits[0].key if hits else None}")
+
+        rng = random.Random(1)
+        targets = rng.sample(list(schemes), RECALL_QUERIES)
+        queries = [typo_mention(name, rng) for name in targets]
+        start = timeit.default_timer()
+        results = [index.search(q, 5) for q in queries]
+        per_query = (timeit.default_timer() - start) / RECALL_QUERIES
+        top1 = sum(bool(hits) and hits[0].key == name for hits, name in zip(results, targets))
+        top5 = sum(name in [h.key for h in hits] for hits, name in zip(results, targets))
+        print(f"{per_query * 1e3:8.3f} ms  misspelt names: top-1 recall {top1 / RECALL_QUERIES:.0%}, "
+              f"top-5 {top5 / RECALL_QUERIES:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for an OpenAI-compatible chat completions API, for tests and
+load runs without a real LLM. It answers every request with the last
+line of the prompt, after a configurable delay; a failure rate can make it
+reply 503.
+
+Usage (from backend/):
+    python -m benchmarks.llm_stub [--port 8090] [--delay-ms 300] [--fail-rate 0]
+    SAHAJ_LLM_URL=http://127.0.0.1:8090/v1 uvicorn app.main:app
+"""
+
+import argparse
+import asyncio
+import random
+
+from fastapi import FastAPI, HTTPException, Request
+
+app = FastAPI(title="LLM stub")
+app.state.delay_ms = 300.0
+app.state.fail_rate = 0.0
+app.state.requests = 0
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    app.state.requests += 1
+    await asyncio.sleep(app.state.delay_ms / 1000)
+    if random.random() < app.state.fail_rate:
+        raise HTTPException(status_code=503, detail="stub failure")
+
+    prompt = body["messages"][-1]["content"]
+    return {
+        "id": f"stub-{app.state.requests}",
+        "object": "chat.completion",
+        "model": body.get("model", "stub"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": f"(simplified) {prompt.splitlines()[-1]}"},
+            "finish_reason": "stop",
+        }],
+    }
+
+
+@app.get("/stats")
+def stats():
+    return {"requests": app.state.requests}
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--delay-ms", type=float, default=300.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    app.state.delay_ms = args.delay_ms
+    app.state.fail_rate = args.fail_rate
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
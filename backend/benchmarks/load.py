@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+End-to-end load benchmark: replays a JSONL workload of chat requests
+against the app and reports throughput and latency percentiles as JSON,
+overall and per request kind.
+
+Modes:
+    asgi     the app in this process through httpx.ASGITransport; no
+             network, so it isolates the app itself. Also measures memory
+             per request in a second, traced pass.
+    uvicorn  a local `uvicorn app.main:app` subprocess over TCP, the way
+             a deployment serves it (or --url to target a running server)
+
+Workload lines are {"kind": ..., "message": ..., "language": ...}; the
+requests are replayed in file order, cycling until --requests is reached,
+by --concurrency clients, and every figure is the median of --rounds such
+rounds. In uvicorn mode the client runs on the same host, so on a machine
+with few cores it competes with the server for CPU.
+
+The workload is a few dozen messages on repeat, so once warmed up nearly
+every request is a response cache hit. The app is therefore measured
+twice and reported in two sections: `cached`, with the caches as
+configured, and `uncached`, with the response and semantic caches
+disabled, so every request runs the full answer pipeline. --cache picks
+one of them.
+
+CPython keeps no running count of allocations, so the memory figures are
+the tracemalloc peak above the starting point per request (client and app
+together) and blocks still allocated after the pass, per request, which
+catches leaks.
+
+`compare` reads two result files and exits with status 1 if the second is
+worse than the first by more than --threshold on any metric.
+
+Usage (from backend/):
+    python -m benchmarks.load run [--mode asgi|uvicorn] [--cache both|on|off] [--requests 2000] [--out new.json]
+    python -m benchmarks.load compare base.json new.json [--threshold 0.1]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import httpx
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKLOAD = os.path.join(BACKEND, "benchmarks", "workloads", "chat.jsonl")
+ENDPOINT = "/api/chat/"
+# cache sizes that switch the app's caches off (read when it is imported)
+NO_CACHE_ENV = {"SAHAJ_CACHE_SIZE": "0", "SAHAJ_SEMANTIC_CACHE_SIZE": "0"}
+SECTIONS = {"cached": True, "uncached": False}   # report section -> caches on
+
+# metric -> (higher is better, absolute slack). Metrics without a slack are
+# compared relative to --threshold; retained blocks hover around zero, so a
+# ratio means nothing and growth by more than the slack is flagged instead.
+METRICS = {
+    "rps": (True, None),
+    "p50_ms": (False, None),
+    "p95_ms": (False, None),
+    "p99_ms": (False, None),
+    "peak_bytes_per_request": (False, None),
+    "retained_blocks_per_request": (False, 1.0),
+}
+
+
+def load_workload(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def percentile(values, q):
+    # nearest rank on sorted values
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, round(q / 100 * len(values)) - 1))]
+
+
+def summary(latencies, elapsed=None):
+    latencies = sorted(latencies)
+    result = {
+        "count": len(latencies),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "max_ms": round(latencies[-1], 3) if latencies else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+    }
+    if elapsed is not None:
+        result["rps"] = round(len(latencies) / elapsed, 1)
+    return result
+
+
+async def replay(client, items, total, concurrency):
+    """Send `total` requests from `concurrency` clients; [(kind, ms, ok)]."""
+    results = []
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index
+        while next_index < total:
+            item = items[next_index % len(items)]
+            next_index += 1
+            start = time.perf_counter()
+            try:
+                response = await client.post(ENDPOINT, json={"message": item["message"], "language": item["language"]})
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            results.append((item["kind"], (time.perf_counter() - start) * 1e3, ok))
+
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return results
+
+
+async def traced_pass(client, items, total):
+    """Sequential replay under tracemalloc: peak bytes and retained blocks per request."""
+    peaks = []
+    tracemalloc.start()
+    blocks = sys.getallocatedblocks()
+    for i in range(total):
+        item = items[i % len(items)]
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        await client.post(ENDPOINT, json={"message": item["message"], "language": item["language"]})
+        peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    retained = sys.getallocatedblocks() - blocks
+    tracemalloc.stop()
+    return {
+        "peak_bytes_per_request": round(sum(peaks) / len(peaks)),
+        "p95_peak_bytes": percentile(sorted(peaks), 95),
+        "retained_blocks_per_request": round(retained / total, 3),
+    }
+
+
+def medians(reports):
+    return {key: statistics.median(r[key] for r in reports) for key in reports[0]}
+
+
+async def measure(client, items, args):
+    """Median over --rounds rounds of each figure, overall and per kind."""
+    await replay(client, items, min(args.warmup, args.requests), args.concurrency)
+    rounds, errors = [], 0
+    for _ in range(args.rounds):
+        start = time.perf_counter()
+        results = await replay(client, items, args.requests, args.concurrency)
+        elapsed = time.perf_counter() - start
+        errors += sum(not ok for _, _, ok in results)
+        kinds = {kind: summary([ms for k, ms, _ in results if k == kind]) for kind, _, _ in results}
+        rounds.append((summary([ms for _, ms, _ in results], elapsed), kinds))
+
+    overall = medians([o for o, _ in rounds])
+    overall["errors"] = errors
+    kinds = {kind: medians([k[kind] for _, k in rounds]) for kind in sorted(rounds[0][1])}
+    return overall, kinds
+
+
+async def run_asgi(items, args, cached):
+    from app.main import app
+    from app.routers import chat
+    from app.utils.lru_cache import TTLCache
+    from app.utils.semantic_cache import SemanticCache
+
+    caches = chat.RESPONSE_CACHE, chat.SEMANTIC_CACHE
+    if not cached:
+        # the same app, with caches that never keep an entry
+        chat.RESPONSE_CACHE, chat.SEMANTIC_CACHE = TTLCache(maxsize=0), SemanticCache(maxsize=0)
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            overall, kinds = await measure(client, items, args)
+            if args.alloc_requests:
+                overall.update(await traced_pass(client, items, args.alloc_requests))
+    finally:
+        chat.RESPONSE_CACHE, chat.SEMANTIC_CACHE = caches
+    return overall, kinds
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(workers, cached=True):
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=BACKEND,
+        env=os.environ if cached else {**os.environ, **NO_CACHE_ENV},
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with status {server.returncode}")
+        try:
+            if httpx.get(url + "/health", timeout=1).status_code == 200:
+                return server, url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("uvicorn did not become healthy within 60 s")
+
+
+async def run_uvicorn(items, args, cached):
+    server, url = (None, args.url) if args.url else start_server(args.workers, cached)
+    try:
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+            return await measure(client, items, args)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    if args.url and args.cache != "on":
+        print("--url: the caches of a running server cannot be switched off; use --cache on", file=sys.stderr)
+        return 2
+    items = load_workload(args.workload)
+    runner = run_asgi if args.mode == "asgi" else run_uvicorn
+    sections = {"on": ["cached"], "off": ["uncached"], "both": list(SECTIONS)}[args.cache]
+    results = {}
+    for section in sections:
+        overall, kinds = asyncio.run(runner(items, args, SECTIONS[section]))
+        results[section] = {"overall": overall, "kinds": kinds}
+    report = {
+        "meta": {
+            "mode": args.mode,
+            "url": args.url,
+            "workload": os.path.relpath(args.workload, BACKEND),
+            "requests": args.requests,
+            "rounds": args.rounds,
+            "concurrency": args.concurrency,
+            "workers": args.workers if args.mode == "uvicorn" and not args.url else None,
+            "cache": args.cache,
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        **results,
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+    return 0 if all(r["overall"]["errors"] == 0 for r in results.values()) else 1
+
+
+def compare(args):
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.new, encoding="utf-8") as f:
+        new = json.load(f)
+    if base["meta"]["mode"] != new["meta"]["mode"]:
+        print(f"warning: comparing {base['meta']['mode']} with {new['meta']['mode']} runs", file=sys.stderr)
+
+    # cached and uncached figures are only ever compared with their own kind
+    sections = []
+    for name in SECTIONS:
+        if name not in base or name not in new:
+            continue
+        old_run, new_run = base[name], new[name]
+        sections.append((f"{name}.overall", old_run["overall"], new_run["overall"]))
+        sections += [(f"{name}.kinds.{k}", old_run["kinds"][k], new_run["kinds"][k])
+                     for k in old_run["kinds"] if k in new_run["kinds"]]
+    if not sections:
+        print("error: the reports share no cached/uncached section", file=sys.stderr)
+        return 2
+    rows, regressions = [], []
+    for section, old, cur in sections:
+        for metric, (higher_is_better, slack) in METRICS.items():
+            if metric not in old or metric not in cur:
+                continue
+            if slack is not None:
+                change = cur[metric] - old[metric]
+                regression = (-change if higher_is_better else change) > slack
+            elif old[metric]:
+                change = cur[metric] / old[metric] - 1
+                regression = (-change if higher_is_better else change) > args.threshold
+            else:
+                continue
+            row = {"metric": f"{section}.{metric}", "base": old[metric], "new": cur[metric],
+                   "change": round(change, 4), "regression": regression}
+            rows.append(row)
+            if row["regression"]:
+                regressions.append(row["metric"])
+
+    print(json.dumps({"threshold": args.threshold, "regressions": regressions, "metrics": rows}, indent=2))
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="replay the workload and report")
+    run_parser.add_argument("--mode", choices=["asgi", "uvicorn"], default="asgi")
+    run_parser.add_argument("--url", help="uvicorn mode: target a running server instead of starting one")
+    run_parser.add_argument("--workers", type=int, default=1, help="uvicorn mode: worker processes")
+    run_parser.add_argument("--cache", choices=["both", "on", "off"], default="both",
+                            help="measure with the response caches on, off, or both (default)")
+    run_parser.add_argument("--workload", default=WORKLOAD)
+    run_parser.add_argument("--requests", type=int, default=2000, help="requests per round")
+    run_parser.add_argument("--rounds", type=int, default=3, help="rounds; each figure is their median")
+    run_parser.add_argument("--warmup", type=int, default=200)
+    run_parser.add_argument("--concurrency", type=int, default=16)
+    run_parser.add_argument("--alloc-requests", type=int, default=500,
+                            help="asgi mode: requests in the traced memory pass (0 skips it)")
+    run_parser.add_argument("--out", help="also write the JSON report here")
+    run_parser.set_defaults(fn=run)
+
+    compare_parser = commands.add_parser("compare", help="flag regressions between two reports")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=0.10,
+                                help="relative change counted as a regression (default 0.10)")
+    compare_parser.set_defaults(fn=compare)
+
+    args = parser.parse_args()
+    sys.exit(args.fn(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Synthetic knowledge-base generator for benchmarks.
+
+Produces deterministic scheme/document names shaped like the real ones
+("pm awas yojana", "income certificate") so benchmarks can be run at
+sizes far beyond what ships in app/data.
+"""
+
+import random
+
+PREFIXES = ["pm", "pradhan mantri", "mukhya mantri", "rashtriya", "state", "national", "atal", "deen dayal"]
+WORDS = [
+    "awas", "kisan", "jan", "dhan", "ujjwala", "jeevan", "jyoti", "suraksha", "bima", "mudra",
+    "shram", "yogi", "maandhan", "fasal", "gramin", "shahari", "swasthya", "poshan", "matru",
+    "vandana", "kaushal", "vikas", "scholarship", "pension", "ration", "vidya", "laxmi", "kanya",
+]
+SUFFIXES = ["yojana", "scheme", "abhiyan", "mission", "nidhi"]
+DOC_WORDS = [
+    "income", "caste", "domicile", "birth", "death", "marriage", "residence", "disability",
+    "land", "ration", "voter", "bank", "property", "character", "migration", "pan",
+]
+DOC_SUFFIXES = ["certificate", "card", "proof", "record", "passbook"]
+
+
+def scheme_names(n, seed=0):
+    rng = random.Random(seed)
+    names = set()
+    while len(names) < n:
+        parts = [rng.choice(PREFIXES)]
+        parts += rng.sample(WORDS, rng.randint(1, 3))
+        parts.append(rng.choice(SUFFIXES))
+        if len(names) > len(PREFIXES) * len(WORDS):
+            parts.append(str(rng.randint(1, n)))
+        names.add(" ".join(parts))
+    return sorted(names)
+
+
+def document_names(n, seed=0):
+    rng = random.Random(seed)
+    names = set()
+    while len(names) < n:
+        parts = rng.sample(DOC_WORDS, rng.randint(1, 2))
+        parts.append(rng.choice(DOC_SUFFIXES))
+        if len(names) > len(DOC_WORDS) * len(DOC_SUFFIXES):
+            parts.append(str(rng.randint(1, n)))
+        names.add(" ".join(parts))
+    return sorted(names)
+
+
+ELIGIBILITY = [
+    "Annual income below 3 lakh", "Annual income below 1.5 lakh", "Annual income up to 8 lakh",
+    "Does not own a pucca house", "Age 18 to 40", "Age 18 to 60", "Aged 60 or above",
+    "Resident of Bihar", "Resident of Uttar Pradesh or Madhya Pradesh", "Resident of Rajasthan",
+    "Must be a farmer", "Woman head of household",
+]
+STATES = ["bihar", "uttar pradesh", "madhya pradesh", "rajasthan", "kerala"]
+
+OFFICE_TYPES = ["csc", "csc", "csc", "tehsil", "aadhaar"]   # CSCs vastly outnumber the rest
+
+
+def offices(n, seed=0):
+    """Office records scattered over India's bounding box, ~20 per pincode."""
+    rng = random.Random(seed)
+    records = []
+    for i in range(n):
+        office_type = rng.choice(OFFICE_TYPES)
+        pincode = str(110001 + i // 20)
+        records.append({
+            "id": f"{office_type}-{i}",
+            "type": office_type,
+            "name": f"{office_type.upper()} {i}",
+            "address": f"Block {i % 97}, District {i // 1000}",
+            "pincode": pincode,
+            "lat": rng.uniform(8.0, 37.0),
+            "lon": rng.uniform(68.0, 97.0),
+        })
+    return records
+
+
+def knowledge_base(n_schemes, n_documents=None, seed=0):
+    """(documents, schemes) dicts shaped like app/data, prerequisites acyclic."""
+    rng = random.Random(seed)
+    doc_keys = document_names(n_documents or max(4, n_schemes // 10), seed)
+    documents = {}
+    for i, key in enumerate(doc_keys):
+        documents[key] = {
+            "documents": ["aadhaar card", "address proof"],
+            "office": rng.choice(["Tehsil Office", "CSC", "Municipal Office"]),
+            # only ever depend on earlier documents, so there are no cycles
+            "prerequisites": rng.sample(doc_keys[:i], min(i, rng.randint(0, 2))) if i % 4 == 0 else [],
+        }
+    schemes = {}
+    for key in scheme_names(n_schemes, seed):
+        schemes[key] = {
+            "description": f"{key.title()} provides support to eligible families.",
+            "eligibility": ["Indian citizen", *rng.sample(ELIGIBILITY, rng.randint(1, 3))],
+            "office": rng.choice(["CSC", "Gram Panchayat", "Block Office"]),
+            "documents": rng.sample(doc_keys, min(3, len(doc_keys))),
+        }
+    return documents, schemes
+
+
+QUESTION_TEMPLATES = [
+    "what documents are required for {}", "tell me about {}", "where is the office for {}",
+    "how do i apply for {}", "who is eligible for {}",
+]
+FILLER_QUESTIONS = [
+    "how do i check my application status", "can i apply online from home",
+    "what is the last date to apply", "is there any fee for this", "whom should i contact for help",
+]
+
+
+def messages(names, n_words, count, seed=0):
+    """
+    count chat messages of about n_words words each, made of questions
+    about random names (or of entity-free filler questions if names is
+    empty), so lookups see both hits and messages that name nothing.
+    """
+    rng = random.Random(seed)
+    result = []
+    for _ in range(count):
+        words = []
+        while len(words) < n_words:
+            if names:
+                question = rng.choice(QUESTION_TEMPLATES).format(rng.choice(names))
+            else:
+                question = rng.choice(FILLER_QUESTIONS)
+            words.extend((question + "?").split())
+        result.append(" ".join(words[:max(n_words, 1)]))
+    return result
@@ -64,6 +64,16 @@ def restart_backend():
     )
     time.sleep(1)
 
+    # Compile the knowledge base so workers map it instead of parsing JSON
+    logger.info("📦 Building KB snapshot...")
+    result = subprocess.run(
+        [sys.executable, "-m", "app.services.knowledge_service"],
+        cwd=BACKEND_DIR,
+        check=False
+    )
+    if result.returncode != 0:
+        logger.warning("⚠️ KB snapshot build failed, backend will load JSON")
+
     # Start new backend
     logger.info("🚀 Starting backend on port 8080...")
     proc = subprocess.Popen(
@@ -1,5 +1,6 @@
 import subprocess
 import os
+import sys
 import re
 import time
 import logging
@@ -50,6 +51,15 @@ def restart_backend():
 
     time.sleep(1)
 
+    # compiled KB snapshot; the backend falls back to the JSON files without it
+    result = subprocess.run(
+        [sys.executable, "-m", "app.services.knowledge_service"],
+        cwd=BACKEND_DIR,
+        check=False
+    )
+    if result.returncode != 0:
+        logger.warning("⚠️ KB snapshot build failed, backend will load JSON")
+
     subprocess.Popen(
         ["uvicorn", "app.main:app", "--host", "0.0.0.0", "--port", "8080"],
         cwd=BACKEND_DIR,
@@ -0,0 +1,57 @@
+import pytest
+
+from app.services.intent_router import iter_questions, split_questions
+
+
+@pytest.mark.parametrize("message, expected", [
+    ("documents for aadhaar? nearest csc office", ["documents for aadhaar", "nearest csc office"]),
+    ("आधार के लिए दस्तावेज़। राशन कार्ड कैसे बनेगा", ["आधार के लिए दस्तावेज़", "राशन कार्ड कैसे बनेगा"]),
+    ("पीएम आवास योजना क्या है॥ पेंशन योजना क्या है", ["पीएम आवास योजना क्या है", "पेंशन योजना क्या है"]),
+])
+def test_punctuation_splits(message, expected):
+    assert split_questions(message) == expected
+    assert split_questions(message, "hi") == expected
+
+
+@pytest.mark.parametrize("word", ["what", "where", "how"])
+def test_separator_words_split(word):
+    assert split_questions(f"tell me about aadhaar {word} is the office") == [
+        "tell me about aadhaar", "is the office",
+    ]
+
+
+def test_separator_word_needs_spaces_around_it():
+    # inside another word, or at the very start, it is not a separator
+    assert split_questions("somewhat unclear anyhow") == ["somewhat unclear anyhow"]
+    assert split_questions("what documents for aadhaar") == ["what documents for aadhaar"]
+
+
+@pytest.mark.parametrize("conjunction", ["और", "तथा", "aur"])
+def test_hindi_conjunctions_split_hindi_only(conjunction):
+    message = f"आधार के लिए दस्तावेज़ {conjunction} नज़दीकी CSC कहाँ है"
+    assert split_questions(message, "hi") == ["आधार के लिए दस्तावेज़", "नज़दीकी CSC कहाँ है"]
+    assert split_questions(message, "en") == [message]
+
+
+def test_short_fragments_are_dropped():
+    # fragments of five characters or fewer are noise
+    assert split_questions("hi? ok? 12345? 123456") == ["123456"]
+    assert split_questions("?।॥") == []
+
+
+def test_unknown_language_uses_english_separators():
+    assert split_questions("aadhaar card और ration card", "ta") == ["aadhaar card और ration card"]
+    assert split_questions("aadhaar card how ration card", "ta") == ["aadhaar card", "ration card"]
+
+
+@pytest.mark.parametrize("message", [
+    "documents for aadhaar?\nwhere is the csc office",
+    "documents for aadhaar\twhere\tis the csc office",
+])
+def test_any_whitespace_bounds_separator_words(message):
+    assert split_questions(message) == ["documents for aadhaar", "is the csc office"]
+
+
+def test_generator_is_lazy():
+    fragments = iter_questions("documents for aadhaar? " + "x" * 10_000)
+    assert next(fragments) == "documents for aadhaar"
@@ -22,3 +22,59 @@ export async function sendChatMessage(message, language = "en") {
 
   return await res.json();
 }
+
+// Streams a chat answer over SSE (POST /api/chat/stream).
+// onAnswer({ index, answer, confidence, elapsed_ms }) fires for each
+// sub-answer as soon as the backend resolves it; the promise resolves with
+// the final ChatResponse from the `done` event.
+export async function streamChatMessage(message, language = "en", { onAnswer } = {}) {
+  const res = await fetch(`${BACKEND_URL}/api/chat/stream`, {
+    method: "POST",
+    headers: {
+      "Content-Type": "application/json",
+      Accept: "text/event-stream",
+    },
+    body: JSON.stringify({
+      message,
+      language,
+    }),
+  });
+
+  if (!res.ok) {
+    const text = await res.text();
+    throw new Error(text || "Backend error");
+  }
+
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  let final = null;
+
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    // SSE events are separated by a blank line
+    let boundary;
+    while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+      const block = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+
+      let event = "message";
+      let data = "";
+      for (const line of block.split("\n")) {
+        if (line.startsWith("event: ")) event = line.slice(7);
+        else if (line.startsWith("data: ")) data += line.slice(6);
+      }
+      if (!data) continue;
+
+      const payload = JSON.parse(data);
+      if (event === "answer" && onAnswer) onAnswer(payload);
+      else if (event === "done") final = payload.response;
+    }
+  }
+
+  if (!final) throw new Error("Stream ended without a response");
+  return final;
+}